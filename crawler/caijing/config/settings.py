@@ -1,9 +1,26 @@
-# 文章保留配置
-ARTICLE_RETENTION_DAYS = 7  # 保留最近7天的文章
-ARTICLE_CLEANUP_ENABLED = False # 是否启用自动清理
+from dataclasses import dataclass
 
-MAX_ARTICLES = 300 # 最大文章数
-MAX_PER_SITE = 100 # 每个站点的最大文章数
-SAVE_DIR = "data/news_articles" # 保存目录
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """财经爬虫设置"""
+    # 文章保留配置
+    article_retention_days: int = 7  # 保留最近7天的文章
+    article_cleanup_enabled: bool = False # 是否启用自动清理
 
-MAX_LINES_DOWNLOADED = 150
\ No newline at end of file
+    max_articles: int = 300 # 最大文章数
+    max_per_site: int = 100 # 每个站点的最大文章数
+    save_dir: str = "data/news_articles" # 保存目录
+
+    max_lines_downloaded: int = 150
+
+SETTINGS = Settings()
+
+# 兼容旧的模块级常量
+ARTICLE_RETENTION_DAYS = SETTINGS.article_retention_days
+ARTICLE_CLEANUP_ENABLED = SETTINGS.article_cleanup_enabled
+
+MAX_ARTICLES = SETTINGS.max_articles
+MAX_PER_SITE = SETTINGS.max_per_site
+SAVE_DIR = SETTINGS.save_dir
+
+MAX_LINES_DOWNLOADED = SETTINGS.max_lines_downloaded
@@ -1,7 +1,8 @@
+import re
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional, Pattern
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SiteConfig:
     """网站配置"""
     name: str       # 站点名称
@@ -14,9 +15,22 @@ class SiteConfig:
     title_selectors: List[str] = field(default_factory=list)   # 标题选择器
     exclude_patterns: List[str] = field(default_factory=list)  # 排除的URL模式
     max_articles_per_day: int = 100  # 每日文章数限制
+    crawl_delay: Optional[float] = None  # 请求间隔(秒)，未设置时使用 robots.txt 的 Crawl-delay
     enabled: bool = True            # 是否启用
+    article_re: Pattern = field(init=False, repr=False, compare=False)  # 预编译的文章URL模式
+    content_selector: str = field(init=False, repr=False, compare=False)  # 合并后的正文选择器
+    date_selector: str = field(init=False, repr=False, compare=False)     # 合并后的日期选择器
+    title_selector: str = field(init=False, repr=False, compare=False)    # 合并后的标题选择器
 
-SITE_CONFIGS = {
+    def __post_init__(self):
+        # 构造时预编译正则，避免在抓取循环中重复编译
+        object.__setattr__(self, 'article_re', re.compile(self.article_pattern))
+        # 合并选择器列表，用于一次遍历判断整页是否有匹配
+        object.__setattr__(self, 'content_selector', ', '.join(self.content_selectors))
+        object.__setattr__(self, 'date_selector', ', '.join(self.date_selectors))
+        object.__setattr__(self, 'title_selector', ', '.join(self.title_selectors))
+
+_RAW_SITE_CONFIGS = {
     'tonghuashun': {
         'name': '同花顺财经',
         'domains': [
@@ -182,4 +196,7 @@ SITE_CONFIGS = {
             r'/live/'
         ]
     }
-} 
\ No newline at end of file
+}
+
+# 导入时构造配置实例
+SITE_CONFIGS = {name: SiteConfig(**config) for name, config in _RAW_SITE_CONFIGS.items()}
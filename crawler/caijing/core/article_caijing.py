@@ -1,42 +1,47 @@
 from crawler.common.article import Article, ArticleExtractor
 from datetime import datetime
 import logging
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
 
 class ArticleCaijing(Article):
     """财经文章类"""
     
     def _parse(self):
         """解析财经文章"""
+        # 构造时计算一次网站域名，to_text 直接使用；解析失败时保持为空
+        self._host = ''
         try:
+            self._host = urlparse(self.url).netloc
+            
             # 直接使用 self.html_parser
-            self.title = ArticleExtractor.extract_title(self.html_parser, self.config)
+            parser = self.html_parser
+            # 使用构造时整理好的选择器
+            selectors = self.selectors
+            
+            self.title = ArticleExtractor.extract_title(parser, selectors)
             
-            self.publish_date = ArticleExtractor.extract_publish_date(self.html_parser, self.config, self.url)
+            self.publish_date = ArticleExtractor.extract_publish_date(parser, selectors, self.url)
             
             self.source = self.url  # 从URL提取域名
             
-            author = ArticleExtractor.extract_author(self.html_parser, self.config)
+            author = ArticleExtractor.extract_author(parser, selectors)
             self.authors = [author] if author else []
             
             # 提取正文内容作为摘要
-            self.summary = ArticleExtractor.extract_content(self.html_parser, self.config)
+            self.summary = ArticleExtractor.extract_content(parser, selectors)
             
         except Exception as e:
-            logging.error(f"解析财经文章失败: {str(e)}")
+            logging.error("解析财经文章失败: %s", e)
     
     def to_text(self) -> str:
         """转换为文本格式"""
-        text_parts = [
-            f"标题：{self.title}",
-            f"发布日期：{self.publish_date.strftime('%Y-%m-%d') if self.publish_date else '未知'}",
-            f"来源：{self.source}",
-            f"网站：{self.url.split('/')[2]}"
-        ]
-        
-        if self.authors:
-            text_parts.append(f"作者：{', '.join(self.authors)}")
-        
-        text_parts.extend(["", "正文：", self.summary])
-        
-        return "\n".join(text_parts) 
\ No newline at end of file
+        date_str = self.publish_date.isoformat()[:10] if self.publish_date else '未知'
+        author_line = f"作者：{', '.join(self.authors)}\n" if self.authors else ""
+        return (
+            f"标题：{self.title}\n"
+            f"发布日期：{date_str}\n"
+            f"来源：{self.source}\n"
+            f"网站：{self._host}\n"
+            f"{author_line}\n"
+            f"正文：\n{self.summary}"
+        )
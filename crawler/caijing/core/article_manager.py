@@ -1,16 +1,41 @@
 import os
-import shutil
-from datetime import datetime, timedelta
+import re
+from datetime import date, datetime, timedelta
 import logging
-from typing import Set
+import time
+import heapq
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
+
+# 日期目录名格式 (YYYY-MM-DD)
+_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+
+def _is_date_dir(name: str) -> bool:
+    """检查目录名是否为有效的日期格式 (YYYY-MM-DD)"""
+    match = _DATE_RE.fullmatch(name)
+    if not match:
+        return False
+    month, day = int(match.group(2)), int(match.group(3))
+    return 1 <= month <= 12 and 1 <= day <= 31
 
 class ArticleManager:
     """文章管理器，负责文章的存储和清理"""
     
+    # 目录扫描结果的缓存时间（秒）
+    _SCAN_TTL = 5.0
+    # 并行删除过期目录的最大线程数
+    _CLEANUP_WORKERS = 8
+    
     def __init__(self, base_dir: str, retention_days: int):
         self.base_dir = base_dir
         self.retention_days = retention_days
         self.logger = logging.getLogger(__name__)
+        # 上次扫描后剩余的最早日期目录，None 表示未知
+        self._oldest_date_cache: Optional[date] = None
+        # 最近一次目录扫描结果及扫描时间
+        self._scan_cache: Optional[Tuple[Set[str], List[str]]] = None
+        self._scan_cache_time = 0.0
         
     def cleanup_old_articles(self) -> int:
         """
@@ -21,63 +46,176 @@ class ArticleManager:
         """
         try:
             cleanup_count = 0
-            cutoff_date = datetime.now() - timedelta(days=self.retention_days)
+            cutoff_date = (datetime.now() - timedelta(days=self.retention_days)).date()
             
-            # 遍历文章目录
-            for date_dir in os.listdir(self.base_dir):
-                try:
-                    # 解析目录名中的日期
-                    dir_date = datetime.strptime(date_dir, '%Y-%m-%d')
-                    
-                    # 如果目录日期早于截止日期，删除整个目录
-                    if dir_date < cutoff_date:
-                        dir_path = os.path.join(self.base_dir, date_dir)
-                        article_count = sum(len(files) for _, _, files in os.walk(dir_path))
-                        shutil.rmtree(dir_path)
-                        cleanup_count += article_count
-                        self.logger.info(f"已清理过期目录: {date_dir}, 文章数: {article_count}")
-                        
-                except ValueError:
+            # 已知最早的日期目录仍在保留期内，无需扫描
+            if self._oldest_date_cache is not None and self._oldest_date_cache > cutoff_date:
+                return 0
+            
+            oldest_date = None
+            self._scan_cache = None
+            targets: List[Tuple[str, str]] = []
+            # 遍历文章目录，收集过期目录
+            with os.scandir(self.base_dir) as it:
+                for entry in it:
+                    date_dir = entry.name
                     # 跳过非日期格式的目录名
-                    continue
-                except Exception as e:
-                    self.logger.error(f"清理目录出错 {date_dir}: {str(e)}")
+                    match = _DATE_RE.fullmatch(date_dir)
+                    if not match:
+                        continue
+                    try:
+                        # 解析目录名中的日期
+                        dir_date = date(*map(int, match.groups()))
+                    except ValueError:
+                        # 跳过无效日期 (如 2024-02-30)
+                        continue
                     
+                    # 如果目录日期不晚于截止日期，删除整个目录
+                    if dir_date <= cutoff_date:
+                        targets.append((entry.path, date_dir))
+                    elif oldest_date is None or dir_date < oldest_date:
+                        oldest_date = dir_date
+            
+            # 各日期目录互不相关，并行删除
+            scan_complete = True
+            if targets:
+                with ThreadPoolExecutor(max_workers=min(self._CLEANUP_WORKERS, len(targets))) as executor:
+                    for article_count in executor.map(self._delete_date_dir, targets):
+                        if article_count < 0:
+                            scan_complete = False
+                        else:
+                            cleanup_count += article_count
+            
+            # 有目录清理失败时不缓存，下次重新扫描
+            self._oldest_date_cache = oldest_date if scan_complete else None
             return cleanup_count
             
         except Exception as e:
-            self.logger.error(f"清理文章出错: {str(e)}")
+            self.logger.error("清理文章出错: %s", e)
             return 0
             
-    def get_article_dates(self) -> Set[str]:
-        """获取所有文章日期"""
-        dates = set()
+    def record_date_dir(self, date_str: str):
+        """写入文章后调用，将其日期目录计入缓存，而不是使缓存失效"""
+        if self._oldest_date_cache is not None:
+            self._oldest_date_cache = min(self._oldest_date_cache, date.fromisoformat(date_str))
+        if self._scan_cache is not None:
+            self._scan_cache[0].add(date_str)
+        
+    def _delete_date_dir(self, target: Tuple[str, str]) -> int:
+        """
+        删除单个过期日期目录
+        
+        Returns:
+            int: 删除的文章数量，出错时返回 -1
+        """
+        dir_path, date_dir = target
         try:
-            for item in os.listdir(self.base_dir):
-                if os.path.isdir(os.path.join(self.base_dir, item)):
-                    try:
-                        # 验证是否为有效日期格式
-                        datetime.strptime(item, '%Y-%m-%d')
-                        dates.add(item)
-                    except ValueError:
-                        continue
+            article_count = self._remove_tree(dir_path)
+            self.logger.info("已清理过期目录: %s, 文章数: %d", date_dir, article_count)
+            return article_count
+        except Exception as e:
+            self.logger.error("清理目录出错 %s: %s", date_dir, e)
+            return -1
+        
+    @classmethod
+    def _remove_tree(cls, dir_path: str) -> int:
+        """
+        删除目录树，在同一次遍历中统计被删除的文章数
+        
+        直接使用 os.unlink/os.rmdir，省去 shutil.rmtree 的逐项 lstat 和错误回调开销
+        
+        Returns:
+            int: 删除的文章文件 (.txt) 数量
+        """
+        article_count = 0
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    article_count += cls._remove_tree(entry.path)
+                else:
+                    os.unlink(entry.path)
+                    if entry.name.endswith('.txt'):
+                        article_count += 1
+        os.rmdir(dir_path)
+        return article_count
+            
+    def _scan_date_dirs(self) -> Tuple[Set[str], List[str]]:
+        """
+        单次扫描基础目录，区分日期目录和非日期目录
+        
+        结果在 _SCAN_TTL 秒内复用，避免启动时连续调用重复读取目录。
+        
+        Returns:
+            Tuple[Set[str], List[str]]: (有效日期集合, 非日期目录路径列表)
+        """
+        if self._is_scan_cache_fresh():
+            return self._scan_cache
+        
+        valid, invalid = set(), []
+        with os.scandir(self.base_dir) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                if _is_date_dir(entry.name):
+                    valid.add(entry.name)
+                else:
+                    invalid.append(entry.path)
+        
+        self._scan_cache = (valid, invalid)
+        self._scan_cache_time = time.monotonic()
+        return self._scan_cache
+        
+    def _is_scan_cache_fresh(self) -> bool:
+        """扫描缓存是否存在且未过期"""
+        return (self._scan_cache is not None and
+                time.monotonic() - self._scan_cache_time < self._SCAN_TTL)
+            
+    def get_article_dates(self, limit: Optional[int] = None, newest_first: bool = False) -> Set[str]:
+        """
+        获取文章日期
+        
+        Args:
+            limit: 最多返回的日期数，None 表示返回全部
+            newest_first: 为 True 时返回最新的 limit 个日期，否则返回任意 limit 个
+            
+        Returns:
+            Set[str]: YYYY-MM-DD 格式的日期集合
+        """
+        try:
+            if limit is not None and limit <= 0:
+                return set()
+            # 只需要任意 limit 个日期且没有可复用的扫描结果时，找够即停止扫描
+            if limit is not None and not newest_first and not self._is_scan_cache_fresh():
+                dates = set()
+                with os.scandir(self.base_dir) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False) and _is_date_dir(entry.name):
+                            dates.add(entry.name)
+                            if len(dates) >= limit:
+                                break
+                return dates
+            
+            dates = self._scan_date_dirs()[0]
+            if limit is None:
+                return set(dates)
+            if newest_first:
+                # YYYY-MM-DD 的字典序即时间顺序
+                return set(heapq.nlargest(limit, dates))
+            return set(islice(dates, limit))
         except Exception as e:
-            self.logger.error(f"获取文章日期出错: {str(e)}")
-        return dates
+            self.logger.error("获取文章日期出错: %s", e)
+            return set()
        
     def cleanup_invalid_directories(self):
         """清理非日期格式的目录"""
         try:
-            for item in os.listdir(self.base_dir):
-                item_path = os.path.join(self.base_dir, item)
-                if os.path.isdir(item_path):
-                    try:
-                        # 检查是否为有效的日期格式 (YYYY-MM-DD)
-                        datetime.strptime(item, '%Y-%m-%d')
-                    except ValueError:
-                        # 如果不是有效的日期格式，删除该目录
-                        self.logger.info(f"删除非日期目录: {item}")
-                        shutil.rmtree(item_path)
+            valid, invalid = self._scan_date_dirs()
+            for path in invalid:
+                self.logger.info("删除非日期目录: %s", os.path.basename(path))
+                self._remove_tree(path)
+            # 非日期目录已删除，更新扫描缓存
+            self._scan_cache = (valid, [])
                         
         except Exception as e:
-            self.logger.error(f"清理非日期目录时出错: {str(e)}")
\ No newline at end of file
+            self._scan_cache = None
+            self.logger.error("清理非日期目录时出错: %s", e)
@@ -1,25 +1,76 @@
 import asyncio
+import atexit
+import hashlib
+import queue
 from crawler.config.settings import CACHE_DIR, DOWNLOADER_CONFIG, ROBOTS_CACHE_DIR
-import httpx
 from selectolax.parser import HTMLParser
 from urllib.parse import urljoin, urlparse
-from collections import deque
+from html import unescape as html_unescape
 import os
 import re
 import logging
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from datetime import date, timedelta
 from typing import Set, Dict, List, Optional, Tuple
 from ..config.site_configs import SiteConfig
 from ...common.robots_parser import RobotsParser
 from ...common.cache_manager import CacheManager
+from ...common.bloom_filter import BloomFilter
+from ...common.rate_limiter import TokenBucket
 from ...common.article import Article
 from ...common.downloader import Downloader, DownloaderError, NetworkError, SSLError
 from .parser import ArticleParser
 import time
-from contextlib import asynccontextmanager
 from .article_manager import ArticleManager
 from ..config.settings import ARTICLE_RETENTION_DAYS, ARTICLE_CLEANUP_ENABLED
 
+# URL 校验和日期提取使用的正则，模块加载时编译一次
+_TONGHUASHUN_ARTICLE_RE = re.compile(r'.*/\d{8}/c\d+\.s?html$')
+_THEPAPER_ARTICLE_RE = re.compile(r'newsDetail_forward_\d+')
+_URL_DATE_PATTERNS = (
+    re.compile(r'/(\d{4})(\d{2})(\d{2})/'),  # 匹配 /20240322/
+    re.compile(r'/(\d{4})-(\d{2})-(\d{2})/'),  # 匹配 /2024-03-22/
+)
+_TEXT_DATE_RE = re.compile(r'(\d{4})[-年/](\d{1,2})[-月/](\d{1,2})')
+_ILLEGAL_FILENAME_RE = re.compile(r'[\\/*?:"<>|]')
+
+def _fingerprint(url: str) -> int:
+    """URL的64位指纹，仅在单次运行内使用，直接复用 str 已缓存的哈希值"""
+    return hash(url)
+
+def _url_digest(url: str) -> str:
+    """URL的稳定摘要（16位十六进制），跨进程一致，可用于文件名"""
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+
+# <a> 标签的 href 属性，依次为双引号、单引号和无引号的取值
+_HREF_RE = re.compile(
+    r'<a\s(?:[^>]*?\s)?href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))',
+    re.I
+)
+
+# 无需解析即可排除的链接前缀和资源文件扩展名
+_SKIP_URL_PREFIXES = ('#', 'javascript:', 'mailto:', 'tel:')
+_BAD_EXT_RE = re.compile(r'\.(?:jpg|jpeg|png|gif|pdf|zip|css|js|ico|svg|webp)(?:[?#]|$)', re.I)
+
+# http(s) 链接的 scheme 和 netloc，用于代替 urlparse 的快速路径
+_HTTP_NETLOC_RE = re.compile(r'https?:(?://([^/?#]*))?', re.I)
+# urlparse 会先去除这些字符，含有它们的链接回退到 urlparse
+_URL_STRIP_CHARS = frozenset('\t\r\n')
+
+def _http_netloc(url: str) -> Optional[str]:
+    """返回 http(s) 链接的 netloc，其他 scheme 返回 None，结果与 urlparse 一致"""
+    if _URL_STRIP_CHARS.isdisjoint(url) and url[:1] > ' ':
+        match = _HTTP_NETLOC_RE.match(url)
+        return (match.group(1) or '') if match else None
+    parsed = urlparse(url)
+    return parsed.netloc if parsed.scheme in ('http', 'https') else None
+
+# 各站点允许的子域名
+_TONGHUASHUN_NETLOCS = frozenset({'news.10jqka.com.cn', 'stock.10jqka.com.cn'})
+_CAIJING_NETLOCS = frozenset({'finance.caijing.com.cn', 'economy.caijing.com.cn'})
+_CAIXIN_NETLOCS = frozenset({'economy.caixin.com', 'finance.caixin.com'})
+_THEPAPER_NETLOCS = frozenset({'www.thepaper.cn'})
+
 class MultiSiteCrawler:
     def __init__(
             self, 
@@ -39,6 +90,10 @@ class MultiSiteCrawler:
         """
         # 只使用启用的站点配置
         self.site_configs = [config for config in site_configs.values() if config.enabled]
+        # 域名 -> 站点配置，已知域名时直接查表
+        self._config_by_domain: Dict[str, SiteConfig] = {
+            config.domain: config for config in self.site_configs
+        }
         self.max_articles = max_articles
         self.max_per_site = max_per_site
         self.save_dir = save_dir
@@ -47,42 +102,51 @@ class MultiSiteCrawler:
         os.makedirs(save_dir, exist_ok=True)
         
         # 为每个站点创建独立的URL队列
-        self.url_queues: Dict[str, deque] = {
-            config.domain: deque([config.start_url]) for config in self.site_configs
-        }
-        self.visited_urls: Dict[str, Set[str]] = {
-            config.domain: set() for config in self.site_configs
+        self.url_queues: Dict[str, asyncio.Queue] = {}
+        for config in self.site_configs:
+            self.url_queues[config.domain] = asyncio.Queue()
+            self.url_queues[config.domain].put_nowait(config.start_url)
+        # 已访问URL使用布隆过滤器去重，每个URL约占 20 bit
+        self.visited_urls: Dict[str, BloomFilter] = {
+            config.domain: BloomFilter(capacity=100000, error_rate=1e-4)
+            for config in self.site_configs
         }
         self.saved_articles_count: Dict[str, int] = {
             config.domain: 0 for config in self.site_configs
         }
         self.total_articles = 0
-        
-        # 设置请求头
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-        }
+        # (日期, 域名) -> 该日期目录下的文章数
+        self.daily_article_counts: Dict[Tuple[str, str], int] = {}
+        # 当天日期和URL日期下限，每次爬取开始时刷新，避免逐个链接调用 datetime.now()
+        self._refresh_date_boundaries()
         
         # 创建日志目录
         log_dir = "log"
         os.makedirs(log_dir, exist_ok=True)
         
-        # 设置日志
+        # 设置日志：文件和控制台的写入由后台线程完成，不阻塞事件循环
         log_file = os.path.join(log_dir, "crawler.log")
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-            handlers=[
+        if not logging.getLogger().handlers:
+            log_queue = queue.SimpleQueue()
+            log_listener = QueueListener(
+                log_queue,
                 logging.FileHandler(log_file, encoding='utf-8'),
                 logging.StreamHandler()  # 同时输出到控制台
-            ]
-        )
+            )
+            log_listener.start()
+            atexit.register(log_listener.stop)
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
+                handlers=[QueueHandler(log_queue)]
+            )
         self.logger = logging.getLogger(__name__)
+        # 链接过滤热路径上的调试日志只在启用 DEBUG 时才调用
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         
         # 添加错误URL记录
-        self.error_urls: Dict[str, Set[str]] = {
+        # 只用于统计，保存URL的64位指纹而非完整字符串
+        self.error_urls: Dict[str, Set[int]] = {
             config.domain: set() for config in self.site_configs
         }
         
@@ -102,11 +166,8 @@ class MultiSiteCrawler:
             **DOWNLOADER_CONFIG)
         self.parser = ArticleParser()
         
-        # 添加限流控制
-        self.rate_limiters: Dict[str, asyncio.Semaphore] = {
-            config.domain: asyncio.Semaphore(concurrent_tasks)
-            for config in self.site_configs
-        }
+        # 按站点的请求限速器，在获取robots规则后初始化；并发数由工作协程数控制
+        self.rate_limiters: Dict[str, TokenBucket] = {}
         
         # 添加统计信息
         self.stats = {
@@ -126,22 +187,6 @@ class MultiSiteCrawler:
         # 清理非日期目录
         self.article_manager.cleanup_invalid_directories()
         
-        # 如果启用了自动清理，在初始化时清理过期文章
-        if ARTICLE_CLEANUP_ENABLED:
-            cleaned_count = self.article_manager.cleanup_old_articles()
-            if cleaned_count > 0:
-                self.logger.info(f"已清理 {cleaned_count} 篇过期文章")
-        
-    @asynccontextmanager
-    async def get_session(self):
-        """获取复用的 HTTP 会话"""
-        session = await self.downloader.get_session()
-        try:
-            yield session
-        finally:
-            if session and not session.is_closed:
-                await session.aclose()
-
     async def init_robots_rules(self):
         """初始化所有站点的robots规则"""
         # 收集所有需要检查的域名
@@ -152,47 +197,64 @@ class MultiSiteCrawler:
             else:
                 domains.add(config.domain)
         
-        # 初始化robots规则
-        await self.robots_parser.init_robots_rules(list(domains))
+        # 初始化robots规则，复用下载器的连接池并发获取
+        await self.robots_parser.init_robots_rules(
+            list(domains), client=await self.downloader.get_session())
+        
+    def _refresh_date_boundaries(self):
+        """刷新缓存的当天日期和链接日期下限（超过3个月的链接不再抓取）"""
+        today = date.today()
+        self._today = today
+        self._today_str = today.isoformat()
+        self._url_min_date = today - timedelta(days=90)
+        
+    def init_rate_limiters(self):
+        """根据站点配置或 robots.txt 的 Crawl-delay 初始化限速器"""
+        for config in self.site_configs:
+            delay = config.crawl_delay
+            if delay is None:
+                delays = [
+                    self.robots_parser.get_crawl_delay(domain)
+                    for domain in (config.domains or [config.domain])
+                ]
+                delay = max((d for d in delays if d), default=None)
+            if delay:
+                self.rate_limiters[config.domain] = TokenBucket(rate=1.0 / delay)
+                self.logger.info(f"{config.domain} 请求间隔: {delay} 秒")
         
     def is_valid_url(self, url: str, current_domain: str) -> bool:
         """检查URL是否有效且属于当前域名"""
         try:
-            parsed = urlparse(url)
+            # 先做廉价的字符串检查，排除明显无效的链接
+            if url.startswith(_SKIP_URL_PREFIXES) or _BAD_EXT_RE.search(url):
+                return False
             
-            # 首先检查robots.txt规则
-            if not self.robots_parser.is_url_allowed(url, parsed.netloc):
-                self.logger.debug(f"URL被robots.txt禁止访问: {url}")
+            netloc = _http_netloc(url)
+            if netloc is None:
+                return False
+            
+            # 检查robots.txt规则
+            if not self.robots_parser.is_url_allowed(url, netloc):
+                if self._debug_enabled:
+                    self.logger.debug("URL被robots.txt禁止访问: %s", url)
                 return False
             
             # 针对同花顺的特殊检查
             if '10jqka.com.cn' in current_domain:
-                allowed_domains = [
-                    'news.10jqka.com.cn',
-                    'stock.10jqka.com.cn',
-                ]
-                if parsed.netloc not in allowed_domains:
+                if netloc not in _TONGHUASHUN_NETLOCS:
                     return False
-                if not re.match(r'.*/\d{8}/c\d+\.s?html$', url):
+                if not _TONGHUASHUN_ARTICLE_RE.match(url):
                     return False
                 return True
             
             # 针对财经网的特殊检查
             if 'caijing.com.cn' in current_domain:
-                allowed_domains = [
-                    'finance.caijing.com.cn',
-                    'economy.caijing.com.cn'
-                ]
-                if parsed.netloc not in allowed_domains:
+                if netloc not in _CAIJING_NETLOCS:
                     return False
                     
             # 针对财新网的特殊检查
             if 'caixin.com' in current_domain:
-                allowed_domains = [
-                    'economy.caixin.com',
-                    'finance.caixin.com'
-                ]
-                if parsed.netloc not in allowed_domains:
+                if netloc not in _CAIXIN_NETLOCS:
                     return False
                 # 根据robots.txt规则排除特定URL
                 if ('?' in url or  # 排除所有带参数的URL
@@ -201,63 +263,38 @@ class MultiSiteCrawler:
                     
             # 针对澎湃新闻的特殊检查
             if 'thepaper.cn' in current_domain:
-                allowed_domains = [
-                    'www.thepaper.cn'
-                ]
-                if parsed.netloc not in allowed_domains:
+                if netloc not in _THEPAPER_NETLOCS:
                     return False
                 # 检查是否是文章页面
                 if 'newsDetail_forward_' in url:
                     # 提取文章ID并验证
-                    if not re.search(r'newsDetail_forward_\d+', url):
+                    if not _THEPAPER_ARTICLE_RE.search(url):
                         return False
                 # 检查是否是允许的频道页面
                 elif 'channel_25951' not in url:
                     return False
                     
             # 其他站点的检查
-            elif current_domain not in parsed.netloc:
+            elif current_domain not in netloc:
                 return False
                 
-            # 通用检查
-            if parsed.scheme not in ['http', 'https']:
-                return False
-            if any(ext in url for ext in ['.jpg', '.png', '.pdf', '.zip']):
-                return False
-            
             # 修改日期提取逻辑，持多种日期格式
-            date_patterns = [
-                r'/(\d{4})(\d{2})(\d{2})/',  # 匹配 /20240322/
-                r'/(\d{4})-(\d{2})-(\d{2})/'  # 匹配 /2024-03-22/
-            ]
-            
-            for pattern in date_patterns:
-                if date_match := re.search(pattern, url):
+            for pattern in _URL_DATE_PATTERNS:
+                if date_match := pattern.search(url):
                     year, month, day = map(int, date_match.groups())
-                    article_date = datetime(year, month, day)
-                    current_date = datetime.now()
-                    delta = current_date - article_date
-                    
                     # 如果文章日期超过3个月，返回False
-                    if delta.days > 90:  # 90��约等于3个月
+                    if date(year, month, day) < self._url_min_date:
                         return False
                     break  # 找到日期后退出循环
             
             return True
         except Exception as e:
-            self.logger.error(f"URL验证出错: {str(e)}")
+            self.logger.error("URL验证出错: %s", e)
             return False
 
-    def get_site_config(self, url: str) -> SiteConfig:
-        """获取URL对应的网站配置"""
-        for config in self.site_configs:
-            if config.domain in url:
-                return config
-        return None
-
     def clean_filename(self, title: str) -> str:
         """清理文件名，移除非法字符"""
-        return re.sub(r'[\\/*?:"<>|]', '', title)
+        return _ILLEGAL_FILENAME_RE.sub('', title)
 
     def parse_article(self, html: HTMLParser, config: SiteConfig, url: str) -> Optional[Article]:
         """解析文章内容和元信息"""
@@ -267,9 +304,8 @@ class MultiSiteCrawler:
                 self.logger.debug(f"文章已存在于缓存中: {url}")
                 return None
             
-            # 2. 使用ArticleParser解析
-            parser = ArticleParser()
-            article = parser.parse_article(html, config, url)
+            # 2. 复用同一个ArticleParser，直接解析 fetch_url 中构建的 DOM
+            article = self.parser.parse_article(html, config, url)
             
             if not article:
                 self.logger.error(f"文章解析失败: {url}")
@@ -301,7 +337,7 @@ class MultiSiteCrawler:
         
         except Exception as e:
             self.logger.error(f"解析文章出错 {url}: {str(e)}", exc_info=True)
-            self.error_urls[config.domain].add(url)
+            self.error_urls[config.domain].add(_fingerprint(url))
             return None
 
     async def save_article(self, article: Article, config: SiteConfig):
@@ -309,70 +345,100 @@ class MultiSiteCrawler:
         try:
             if not article:
                 return
-
-            # 构建保存路径: data/news_articles/YYYY-MM-DD/domain.com/
-            date_dir = os.path.join(self.save_dir, article.publish_date.strftime('%Y-%m-%d'))
-            domain_dir = os.path.join(date_dir, config.domain)
             
-            try:
-                # 先创建日期目录，再创建域名目录
-                os.makedirs(domain_dir, exist_ok=True)
-            except Exception as e:
-                self.logger.error(f"创建保存目录失败: {domain_dir}, 错误: {str(e)}")
+            # 已保存过的URL直接跳过，无需访问磁盘
+            if self.cache_manager.is_cached(article.url, config.domain):
+                self.logger.debug("文章已保存过，跳过: %s", article.url)
                 return
+
+            # 构建保存路径: data/news_articles/YYYY-MM-DD/domain.com/
+            date_str = article.publish_date.isoformat()[:10]
+            domain_dir = os.path.join(self.save_dir, date_str, config.domain)
             
             # 清理文件名
             title = self.clean_filename(article.title)
             if not title:
-                title = f"article_{hash(article.url)}"
+                # 使用稳定的URL摘要，保证多次运行得到相同的文件名
+                title = f"article_{_url_digest(article.url)}"
             
-            # 构建文件路径
-            file_path = os.path.join(domain_dir, f"{title}.txt")
-            
-            # 如果文件已存在，检查是否是相同的URL
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if f"来源：{article.url}" in content:
-                            self.logger.debug(f"文件已存在且URL相同，跳过: {file_path}")
-                            return
-                except Exception as e:
-                    self.logger.error(f"读取已存在文件失败: {file_path}, 错误: {str(e)}")
-                    return
+            # 写入在线程中进行，期间其他协程也可能通过 parse_article 中的检查，
+            # 因此在 await 之前再次检查限制并预占名额，未写入时归还
+            if self._limit_reached(config.domain):
+                self.logger.info("已达文章数量限制: %s", article.url)
+                return
+            if self.get_today_article_count(config.domain) >= config.max_articles_per_day:
+                self.logger.info("%s 今日文章数已达上限", config.domain)
+                return
+            count_key = (date_str, config.domain)
+            self._update_counts(count_key, 1)
             
-            # 写入文件
+            # 磁盘读写放到线程中执行，避免阻塞事件循环
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    self.logger.info(f"写入文件: {file_path}")
-                    f.write(article.to_text())
-            except Exception as e:
-                self.logger.error(f"写入文件失败: {file_path}, 错误: {str(e)}")
+                file_path = await asyncio.to_thread(
+                    self._write_article_file, article, domain_dir, title)
+            except BaseException:
+                self._update_counts(count_key, -1)
+                raise
+            if file_path is None:
+                self._update_counts(count_key, -1)
                 return
-            
-            # 更新计数器
-            self.saved_articles_count[config.domain] += 1
-            self.total_articles += 1
+            self.article_manager.record_date_dir(date_str)
             
             # 添加到缓存
             self.cache_manager.add_to_cache(article.url, config.domain)
             
-            self.logger.info(f"保存文章成功: {file_path}")
+            self.logger.info("保存文章成功: %s", file_path)
             
         except Exception as e:
-            self.logger.error(f"保存文章失败 {article.url if article else 'unknown'}: {str(e)}")
+            self.logger.error("保存文章失败 %s: %s", article.url if article else 'unknown', e)
+
+    def _update_counts(self, count_key: Tuple[str, str], delta: int):
+        """按 delta 更新站点、总数和当日的文章计数"""
+        domain = count_key[1]
+        self.saved_articles_count[domain] += delta
+        self.total_articles += delta
+        if count_key in self.daily_article_counts:
+            self.daily_article_counts[count_key] += delta
+
+    def _write_article_file(self, article: Article, domain_dir: str, title: str) -> Optional[str]:
+        """
+        同步写入文章文件，在工作线程中执行
+        
+        以独占模式创建文件，不覆盖已有文章。标题重名时改用带URL摘要后缀的文件名，
+        该文件也已存在说明同一URL已写入过。
+        
+        Returns:
+            Optional[str]: 写入的文件路径，未写入返回None
+        """
+        try:
+            # 先创建日期目录，再创建域名目录
+            os.makedirs(domain_dir, exist_ok=True)
+        except Exception as e:
+            self.logger.error(f"创建保存目录失败: {domain_dir}, 错误: {str(e)}")
+            return None
+        
+        text = article.to_text()
+        for name in (title, f"{title}_{_url_digest(article.url)}"):
+            file_path = os.path.join(domain_dir, f"{name}.txt")
+            try:
+                with open(file_path, 'x', encoding='utf-8') as f:
+                    self.logger.info(f"写入文件: {file_path}")
+                    f.write(text)
+                return file_path
+            except FileExistsError:
+                continue
+            except Exception as e:
+                self.logger.error(f"写入文件失败: {file_path}, 错误: {str(e)}")
+                return None
+        
+        self.logger.debug(f"文件已存在且URL相同，跳过: {file_path}")
+        return None
 
     def is_article_page(self, url: str, config: SiteConfig) -> bool:
         """判断是否是文章页面"""
         try:
-            # 使用正则表达式匹配URL模式
-            pattern = config.article_pattern
-            if not pattern.startswith('^'):
-                pattern = f".*{pattern}"
-            if not pattern.endswith('$'):
-                pattern = f"{pattern}.*"
-            
-            return bool(re.match(pattern, url))
+            # 使用预编译的正则表达式匹配URL模式
+            return bool(config.article_re.search(url))
         except Exception as e:
             self.logger.error(f"检查文章页面时出错: {str(e)}")
             return False
@@ -381,7 +447,7 @@ class MultiSiteCrawler:
         """提取文章日期"""
         try:
             # 1. 从URL中提取日期
-            if match := re.search(r'/(\d{4})(\d{2})(\d{2})/', url):
+            if match := _URL_DATE_PATTERNS[0].search(url):
                 year, month, day = match.groups()
                 if (1900 <= int(year) <= 2100 and 
                     1 <= int(month) <= 12 and 
@@ -392,7 +458,7 @@ class MultiSiteCrawler:
             for selector in config.date_selectors:
                 if date_elem := html.css_first(selector):
                     text = date_elem.text()
-                    if match := re.search(r'(\d{4})[-年/](\d{1,2})[-月/](\d{1,2})', text):
+                    if match := _TEXT_DATE_RE.search(text):
                         year, month, day = match.groups()
                         if (1900 <= int(year) <= 2100 and 
                             1 <= int(month) <= 12 and 
@@ -408,61 +474,63 @@ class MultiSiteCrawler:
     def is_article_within_days(self, date_str: str, days: int = 7) -> bool:
         """检查文章日期是否在指定天数内"""
         try:
-            article_date = datetime.strptime(date_str, '%Y-%m-%d')
-            today = datetime.now()
-            delta = today - article_date
-            return delta.days <= days
+            # 直接拆分为整数，省去 strptime 的格式解析开销
+            year, month, day = map(int, date_str.split('-'))
+            return (self._today - date(year, month, day)).days <= days
         except Exception as e:
             self.logger.error(f"日期检查出错: {str(e)}")
             return False
 
     async def fetch_url(self, url: str, domain: str) -> Tuple[str, List[str]]:
         """获取页面内容和链接"""
-        async with self.rate_limiters[domain]:
-            try:
-                # 修改为直接使用 downloader 的 get 方法
-                response = await self.downloader.get(url)
-                if not response:
-                    raise NetworkError(f"Failed to get response from {url}")
-                
-                # 处理编码
-                content = (response.content.decode('gbk') 
-                          if '10jqka.com.cn' in url 
-                          else response.text)
-                
-                # 解析页面
-                html = HTMLParser(content)
-                
-                # 提取链接
-                links = self._extract_links(html, url, domain)
-                
-                # 处理文章
-                if self.is_article_page(url, self.get_site_config(url)):
-                    await self._process_article(html, url, domain)
-                
-                return url, links
-                    
-            except (NetworkError, SSLError) as e:
-                self.logger.warning(f"{e.__class__.__name__}: {str(e)}")
-                self.error_urls[domain].add(url)
-                self.stats[domain]['error_count'] += 1
-                return url, []
-                
-            except DownloaderError as e:
-                self.logger.error(f"下载错误: {str(e)}", exc_info=True)
-                self.error_urls[domain].add(url)
-                self.stats[domain]['error_count'] += 1
-                return url, []
+        # 按站点限速
+        if limiter := self.rate_limiters.get(domain):
+            await limiter.acquire()
+        
+        try:
+            # 修改为直接使用 downloader 的 get 方法
+            response = await self.downloader.get(url)
+            if not response:
+                raise NetworkError(f"Failed to get response from {url}")
+            
+            # 同花顺页面为GBK编码，指定编码后由 httpx 只解码一次（非法字节替换而非抛错）
+            if '10jqka.com.cn' in url:
+                response.encoding = 'gbk'
+            content = response.text
+            
+            # 直接从原始HTML中提取链接，无需构建DOM
+            links = self._extract_links(content, url, domain)
+            
+            # 只有文章页面才需要解析DOM，之前已保存过的文章无需重复解析
+            if self.is_article_page(url, self._config_by_domain[domain]):
+                if self.cache_manager.is_cached(url, domain):
+                    self.stats[domain]['skip_count'] += 1
+                else:
+                    await self._process_article(HTMLParser(content), url, domain)
+            
+            return url, links
                 
-            except Exception as e:
-                self.logger.error(f"抓取页面失败 {url}: {str(e)}", exc_info=True)
-                self.error_urls[domain].add(url)
-                self.stats[domain]['error_count'] += 1
-                return url, []
+        except (NetworkError, SSLError) as e:
+            self.logger.warning(f"{e.__class__.__name__}: {str(e)}")
+            self.error_urls[domain].add(_fingerprint(url))
+            self.stats[domain]['error_count'] += 1
+            return url, []
+            
+        except DownloaderError as e:
+            self.logger.error(f"下载错误: {str(e)}", exc_info=True)
+            self.error_urls[domain].add(_fingerprint(url))
+            self.stats[domain]['error_count'] += 1
+            return url, []
+            
+        except Exception as e:
+            self.logger.error(f"抓取页面失败 {url}: {str(e)}", exc_info=True)
+            self.error_urls[domain].add(_fingerprint(url))
+            self.stats[domain]['error_count'] += 1
+            return url, []
 
     async def _process_article(self, html: HTMLParser, url: str, domain: str):
         """处理文章页面"""
-        config = self.get_site_config(url)
+        config = self._config_by_domain[domain]
         article = self.parse_article(html, config, url)
         
         if article:
@@ -471,101 +539,123 @@ class MultiSiteCrawler:
         else:
             self.stats[domain]['skip_count'] += 1
 
-    def _extract_links(self, html: HTMLParser, base_url: str, domain: str) -> List[str]:
-        """提取并过滤页面链接"""
+    def _extract_links(self, content: str, base_url: str, domain: str) -> List[str]:
+        """使用单个正则扫描原始HTML，提取并过滤页面链接"""
         links = []
+        href = None
+        # 热路径中反复使用的属性提前绑定为局部变量
+        is_valid_url = self.is_valid_url
+        visited = self.visited_urls[domain]
+        # 导航栏等处的重复链接在同一页面内只处理一次
+        seen: Set[str] = set()
         try:
-            for a in html.css('a[href]'):
+            for match in _HREF_RE.finditer(content):
                 try:
                     # 获取 href 属性，如果不存在则跳过
-                    href = a.attributes.get('href')
-                    if not href:
+                    href = match.group(1) or match.group(2) or match.group(3)
+                    if not href or href in seen:
                         continue
+                    seen.add(href)
                     
+                    # 属性值中可能包含HTML实体，如 &amp;
+                    if '&' in href:
+                        href = html_unescape(href)
                     href = href.strip()
-                    if not href or href.startswith(('#', 'javascript:', 'mailto:')):
+                    if not href or href.startswith(_SKIP_URL_PREFIXES):
                         continue
                     
-                    # 构建完整URL
+                    # 构建完整URL，已访问过的链接无需再校验
                     absolute_url = urljoin(base_url, href)
-                    if self.is_valid_url(absolute_url, domain):
+                    if absolute_url not in visited and is_valid_url(absolute_url, domain):
                         links.append(absolute_url)
                     
                 except Exception as e:
-                    self.logger.debug(f"处理单个链接出错 {base_url} -> {href if href else 'unknown'}: {str(e)}")
+                    if self._debug_enabled:
+                        self.logger.debug("处理单个链接出错 %s -> %s: %s", base_url, href or 'unknown', e)
                     continue
                 
         except Exception as e:
-            self.logger.error(f"提取链接出错 {base_url}: {str(e)}", exc_info=True)
+            self.logger.error("提取链接出错 %s: %s", base_url, e, exc_info=True)
         
         return links
 
     def get_today_article_count(self, domain: str) -> int:
         """获取当天的文章数量"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        today_dir = os.path.join(self.save_dir, today, domain)
+        today = self._today_str
+        count_key = (today, domain)
+        # 每天每个站点只读取一次目录，之后由 save_article 在内存中累加
+        if count_key in self.daily_article_counts:
+            return self.daily_article_counts[count_key]
         
+        today_dir = os.path.join(self.save_dir, today, domain)
+        count = 0
         try:
-            if os.path.exists(today_dir):
-                return len([f for f in os.listdir(today_dir) 
-                          if f.endswith('.txt')])
+            with os.scandir(today_dir) as it:
+                count = sum(1 for entry in it if entry.name.endswith('.txt'))
+        except FileNotFoundError:
+            count = 0
         except Exception as e:
             self.logger.error(f"统计今日文章数出错: {str(e)}")
-        return 0
+            return 0
+        self.daily_article_counts[count_key] = count
+        return count
+
+    def _limit_reached(self, domain: str) -> bool:
+        """检查是否已达到总数或单站点的文章数限制"""
+        return (self.total_articles >= self.max_articles or
+                self.saved_articles_count[domain] >= self.max_per_site)
+
+    async def _crawl_worker(self, domain: str, stop_event: asyncio.Event):
+        """站点工作协程，从URL队列中取出链接并抓取"""
+        queue = self.url_queues[domain]
+        while True:
+            url = await queue.get()
+            try:
+                if self._limit_reached(domain):
+                    stop_event.set()
+                    continue
+                if not self.visited_urls[domain].add(url):
+                    continue
+                
+                _, new_links = await self.fetch_url(url, domain)
+                
+                # 检查是否已达到限制
+                if self._limit_reached(domain):
+                    stop_event.set()
+                    continue
+                for link in new_links:
+                    queue.put_nowait(link)
+            except Exception as e:
+                self.logger.error(f"处理任务结果出错: {str(e)}", exc_info=True)
+            finally:
+                queue.task_done()
 
     async def crawl_site(self, config: SiteConfig):
         """爬取单个站点"""
         domain = config.domain
         self.stats[domain]['start_time'] = time.time()
         
+        stop_event = asyncio.Event()
+        workers = [
+            asyncio.create_task(self._crawl_worker(domain, stop_event))
+            for _ in range(self.concurrent_tasks)
+        ]
+        waiters = [
+            asyncio.create_task(self.url_queues[domain].join()),  # 队列中的URL全部处理完
+            asyncio.create_task(stop_event.wait())               # 达到文章数限制
+        ]
+        
         try:
-            tasks = []
-            while (self.url_queues[domain] and 
-                   self.total_articles < self.max_articles and  # 检查总数限制
-                   self.saved_articles_count[domain] < self.max_per_site):  # 检查单站点限制
-                
-                # 创建新任务直到达到并发限制
-                while (len(tasks) < self.concurrent_tasks and 
-                       self.url_queues[domain]):
-                    url = self.url_queues[domain].popleft()
-                    if url not in self.visited_urls[domain]:
-                        self.visited_urls[domain].add(url)
-                        task = asyncio.create_task(self.fetch_url(url, domain))
-                        tasks.append(task)
-                
-                if not tasks:
-                    break
-                    
-                # 等待任务完成
-                done, pending = await asyncio.wait(
-                    tasks,
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-                
-                # 处理完成的任务
-                for task in done:
-                    try:
-                        url, new_links = await task
-                        # 检查是否已达到限制
-                        if (self.total_articles >= self.max_articles or 
-                            self.saved_articles_count[domain] >= self.max_per_site):
-                            # 取消所有待处理的任务
-                            for pending_task in pending:
-                                pending_task.cancel()
-                            return  # 直接返回，结束爬取
-                            
-                        if new_links:
-                            self.url_queues[domain].extend(new_links)
-                    except Exception as e:
-                        self.logger.error(f"处理任务结果出错: {str(e)}", exc_info=True)
-                    tasks.remove(task)
-                
-                tasks = list(pending)
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
                 
         except Exception as e:
             self.logger.error(f"站点爬取出错 {domain}: {str(e)}", exc_info=True)
             
         finally:
+            # 取消所有工作协程，结束爬取
+            for task in workers + waiters:
+                task.cancel()
+            await asyncio.gather(*workers, *waiters, return_exceptions=True)
             self.stats[domain]['end_time'] = time.time()
             await self._print_site_stats(domain)
 
@@ -589,46 +679,62 @@ class MultiSiteCrawler:
 
     async def crawl(self):
         """并行爬取所有站点"""
+        self._refresh_date_boundaries()
+        # 如果启用了自动清理，每次爬取前清理过期文章；最早的日期目录仍在保留期内时不会扫描目录
+        if ARTICLE_CLEANUP_ENABLED:
+            cleaned_count = await asyncio.to_thread(self.article_manager.cleanup_old_articles)
+            if cleaned_count > 0:
+                self.logger.info(f"已清理 {cleaned_count} 篇过期文章")
         await self.init_robots_rules()
+        self.init_rate_limiters()
         
-        async with httpx.AsyncClient(
-            headers=self.headers,
-            timeout=30.0,
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-        ) as client:
-            tasks = []
-            for config in self.site_configs:
-                task = asyncio.create_task(self.crawl_site(config))
-                tasks.append(task)
-            
-            try:
-                # 等待所有任务完成或直到达到总数限制
-                while tasks:
-                    done, pending = await asyncio.wait(
-                        tasks,
-                        return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    # 处理完成的任务
-                    for task in done:
-                        try:
-                            await task
-                        except Exception as e:
-                            self.logger.error(f"任务执行出错: {str(e)}", exc_info=True)
-                        tasks.remove(task)
-                    
-                    # 如果达到总数限制，取消剩余任务并退出
-                    if self.total_articles >= self.max_articles:
-                        self.logger.info(f"已达到总文章限制 {self.max_articles}，停止爬取")
-                        for task in pending:
-                            task.cancel()
-                        break
-                    
-                    tasks = list(pending)
-                    
-            except Exception as e:
-                self.logger.error(f"爬取过程出错: {str(e)}", exc_info=True)
-                # 取消所有未完成的任务
-                for task in tasks:
-                    if not task.done():
-                        task.cancel()
\ No newline at end of file
+        tasks = []
+        for config in self.site_configs:
+            task = asyncio.create_task(self.crawl_site(config))
+            tasks.append(task)
+        
+        try:
+            # 等待所有任务完成或直到达到总数限制
+            while tasks:
+                done, pending = await asyncio.wait(
+                    tasks,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                # 处理完成的任务
+                for task in done:
+                    try:
+                        await task
+                    except Exception as e:
+                        self.logger.error(f"任务执行出错: {str(e)}", exc_info=True)
+                    tasks.remove(task)
+                
+                # 如果达到总数限制，取消剩余任务并退出
+                if self.total_articles >= self.max_articles:
+                    self.logger.info(f"已达到总文章限制 {self.max_articles}，停止爬取")
+                    for task in pending:
+                        task.cancel()
+                    break
+                
+                tasks = list(pending)
+                
+        except Exception as e:
+            self.logger.error(f"爬取过程出错: {str(e)}", exc_info=True)
+            # 取消所有未完成的任务
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        finally:
+            # 下载器和缓存在多次爬取间复用，由 close 统一关闭
+            self.cache_manager.flush()
+    
+    async def close(self):
+        """关闭下载器会话并合并URL缓存，不再爬取时调用"""
+        await self.downloader.close()
+        self.cache_manager.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
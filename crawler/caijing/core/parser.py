@@ -1,9 +1,8 @@
 from crawler.caijing.core.article_caijing import ArticleCaijing
 from selectolax.parser import HTMLParser
-from typing import Optional, Dict
+from typing import Optional
 from ...common.article import Article
 import logging
-from functools import lru_cache
 
 class ArticleParser:
     """文章解析器"""
@@ -11,14 +10,6 @@ class ArticleParser:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         
-    @lru_cache(maxsize=128)
-    def get_domain_config(self, url: str, configs: Dict) -> Optional[dict]:
-        """获取URL对应的域名配置"""
-        for domain, config in configs.items():
-            if domain in url:
-                return config
-        return None
-        
     def parse_article(self, html: HTMLParser, config: dict, url: str) -> Optional[Article]:
         """
         解析文章内容
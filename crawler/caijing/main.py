@@ -1,6 +1,7 @@
 import asyncio
+from dataclasses import replace
 from crawler.caijing.config.settings import MAX_ARTICLES, MAX_PER_SITE, SAVE_DIR
-from crawler.caijing.config.site_configs import SITE_CONFIGS, SiteConfig
+from crawler.caijing.config.site_configs import SITE_CONFIGS
 from crawler.caijing.core.crawler import MultiSiteCrawler
 import logging
 
@@ -26,7 +27,7 @@ async def main():
     
     # 更新站点配置的启用状态
     site_configs = {
-        name: SiteConfig(**config) if isinstance(config, dict) else config
+        name: config
         for name, config in SITE_CONFIGS.items()
         if name in enabled_sites  # 只包含在 enabled_sites 中定义的站点
     }
@@ -35,9 +36,10 @@ async def main():
     if not site_configs:
         raise ValueError("没有找到任何可用的站点配置，请检查 SITE_CONFIGS 是否包含已启用的站点")
     
+    # SiteConfig 为不可变对象，通过 replace 生成新实例
     for site_name, enabled in enabled_sites.items():
         if site_name in site_configs:
-            site_configs[site_name].enabled = enabled
+            site_configs[site_name] = replace(site_configs[site_name], enabled=enabled)
     
     # 添加调试信息
     print("可用的站点配置:")
@@ -58,13 +60,12 @@ async def main():
     }
     
     # 创建爬虫实例并开始爬取
-    crawler = MultiSiteCrawler(
+    async with MultiSiteCrawler(
         site_configs=site_configs,
         **crawler_config
-    )
-    
-    # 运行爬虫
-    await crawler.crawl()
+    ) as crawler:
+        # 运行爬虫
+        await crawler.crawl()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
@@ -1,13 +1,85 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Optional, List, Tuple, Callable, Pattern
+from typing import Optional, List, Tuple, Callable, Pattern, Iterator
 from crawler.caijing.config.settings import MAX_LINES_DOWNLOADED
 from crawler.common.date_extractor import DateExtractor
 from selectolax.parser import HTMLParser
 import re
 import logging
-from functools import lru_cache
 import inspect
+from functools import cached_property, lru_cache
+
+@lru_cache(maxsize=64)
+def _join_selectors(selectors: Tuple[str, ...]) -> str:
+    """将选择器列表合并为一个CSS并集选择器"""
+    return ', '.join(selectors)
+
+def _iter_lines(text: str, limit: int) -> Iterator[str]:
+    """逐行产出文本的前 limit 行，不为其余的行创建字符串"""
+    start = 0
+    for _ in range(limit):
+        end = text.find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+class ConfigSelectors:
+    """
+    从站点配置中统一整理出的选择器
+    
+    站点配置可能是带 *_selectors 属性的对象、带 selectors 字典的对象或普通字典，
+    构造文章时整理一次，各个提取方法无需再逐个探测配置格式。
+    """
+    __slots__ = (
+        'legacy_title', 'title', 'title_joined',
+        'legacy_date', 'date_format', 'date', 'date_joined',
+        'author', 'category', 'content', 'content_joined',
+    )
+    
+    def __init__(self, config):
+        selectors = getattr(config, 'selectors', None)
+        if not isinstance(selectors, dict):
+            selectors = None
+        
+        # 标题：selectors 字典中的 title，以及 title_selectors 属性
+        self.legacy_title: List[str] = selectors.get('title', []) if selectors else []
+        self.title: List[str] = getattr(config, 'title_selectors', [])
+        self.title_joined: Optional[str] = getattr(config, 'title_selector', None)
+        
+        # 日期：selectors 字典中的 date/date_format，以及 date_selectors 属性
+        self.legacy_date: Optional[str] = selectors.get('date') if selectors else None
+        self.date_format: Optional[str] = selectors.get('date_format') if selectors else None
+        self.date: List[str] = getattr(config, 'date_selectors', [])
+        self.date_joined: Optional[str] = getattr(config, 'date_selector', None)
+        
+        # 作者：selectors 字典或普通字典中的 selectors.author
+        author = []
+        if selectors:
+            author = selectors.get('author', [])
+        elif isinstance(config, dict):
+            author = config.get('selectors', {}).get('author', [])
+        self.author: List[str] = [author] if isinstance(author, str) else author
+        
+        self.category: List[str] = getattr(config, 'category_selectors', None) or []
+        
+        # 正文：content_selectors 属性，其次 selectors 字典，最后普通字典
+        self.content_joined: Optional[str] = None
+        if hasattr(config, 'content_selectors'):
+            self.content: List[str] = config.content_selectors
+            self.content_joined = getattr(config, 'content_selector', None)
+        elif selectors:
+            self.content = selectors.get('content', [])
+        elif isinstance(config, dict):
+            self.content = config.get('content_selectors', [])
+        else:
+            self.content = []
+    
+    @classmethod
+    def of(cls, config) -> 'ConfigSelectors':
+        """已整理过的直接返回，否则从配置中整理"""
+        return config if isinstance(config, cls) else cls(config)
 
 class ArticleExtractor:
     """文章提取器，包含所有静态提取方法"""
@@ -76,14 +148,132 @@ class ArticleExtractor:
         ]
     }
     
+    # 合并后的通用选择器
+    COMMON_SELECTORS_JOINED = {
+        field: ', '.join(selectors) for field, selectors in COMMON_SELECTORS.items()
+    }
+    
+    # 正文清理时要移除的内容，按类别依次处理
+    # 1. JavaScript 代码块和样式
+    CLEAN_JS_PATTERNS = [
+        r'<script[\s\S]*?</script>',  # script标签及内容
+        r'<style[\s\S]*?</style>',    # style标签及内容
+        r'var\s+.*?;',                # 变量声明
+        r'function\s*.*?{[\s\S]*?}',  # 函数定义
+        r'\(sinaads\s*=.*?\);',       # 广告代码
+        r'\(\s*function\s*\(\s*\)[\s\S]*?\}\s*\)\s*\(\s*\);', # 自执行函数
+        r'\.[\w-]+\s*{[^}]*}',        # CSS类定义
+        r'#[\w-]+\s*{[^}]*}',         # CSS ID定义
+        r'//.*?(?:\n|$)',             # 单行注释
+        r'/\*[\s\S]*?\*/',            # 多行注释
+    ]
+    # 2. HTML 标签和属性
+    CLEAN_HTML_PATTERNS = [
+        r'<[^>]+>',                   # HTML标签
+        r'&[a-zA-Z0-9]+;',           # HTML实体
+        r'\.appendQr_wrap.*?(?:\n|$)', # 特定的HTML类
+        r'\.mag_topad.*?(?:\n|$)',     # 广告相关类
+        r'\.news_lt.*?(?:\n|$)',       # 新闻相关类
+        r'\.vip-class.*?(?:\n|$)',     # VIP相关类
+    ]
+    # 3. 文章元信息
+    CLEAN_META_PATTERNS = [
+        r'\(编辑[：:]\s*.*?\)',
+        r'\(记者[：:]\s*.*?\)',
+        r'作者[：:]\s*.*?(?:\n|$)',
+        r'来源[：:]\s*.*?(?:\n|$)',
+        r'本来源.*?(?:\n|$)',
+        r'原文链接.*?(?:\n|$)',
+        r'关键字[：:]\s*.*?(?:\n|$)',
+        r'责任编辑.*?(?:\n|$)',
+        r'编辑[：:]\s*.*?(?:\n|$)',
+        r'本文来源于.*?(?:\n|$)',
+    ]
+    # 4. 导航和位置信息
+    CLEAN_NAV_PATTERNS = [
+        r'当前位置：.*?(?:\n|$)',
+        r'返回首页.*?(?:\n|$)',
+        r'举报.*?(?:\n|$)',
+        r'分享到：.*?(?:\n|$)',
+        r'相关专题：.*?(?:\n|$)',
+        r'相关新闻：.*?(?:\n|$)',
+        r'热门推荐.*?(?:\n|$)',
+        r'合作伙伴.*?(?:\n|$)',
+        r'友情链接.*?(?:\n|$)',
+    ]
+    # 5. 广告和推广
+    CLEAN_AD_PATTERNS = [
+        r'更多精彩内容.*?(?:\n|$)',
+        r'关注.*?获取更多.*?(?:\n|$)',
+        r'点击关注.*?(?:\n|$)',
+        r'https?://\S+',             # URL
+        r'APP专享.*?(?:\n|$)',
+        r'扫描二维码.*?(?:\n|$)',
+        r'海量资讯.*?(?:\n|$)',
+        r'热门文章.*?(?:\n|$)',
+        r'编辑推荐.*?(?:\n|$)',
+    ]
+    
+    # 预编译的清理正则，按类别和模式的原有顺序逐个作用于整个正文。
+    # 不能合并为交替：交替只取最左侧的匹配，移除结果与依次替换不同
+    CLEAN_RES: List[Pattern] = [
+        re.compile(pattern, flags)
+        for patterns, flags in (
+            (CLEAN_JS_PATTERNS, re.MULTILINE | re.IGNORECASE),
+            (CLEAN_HTML_PATTERNS, re.MULTILINE),
+            (CLEAN_META_PATTERNS, re.MULTILINE),
+            (CLEAN_NAV_PATTERNS, re.MULTILINE),
+            (CLEAN_AD_PATTERNS, re.MULTILINE),
+        )
+        for pattern in patterns
+    ]
+    
+    # 疑似代码或样式的段落特征，合并为一个正则后每个段落只需扫描一遍
+    CODE_MARKER_RE = re.compile(
+        r'function|var |document\.|window\.|javascript|\.css|==|\+\+|--|[{};#@]',
+        re.IGNORECASE
+    )
+    
+    # 正文中的 arXiv 编号，如 arXiv:2403.12345
+    ARXIV_ID_RE = re.compile(r'arXiv:\s*(\d+\.\d+)')
+    
+    # 段落过滤使用的正则
+    WHITESPACE_RE = re.compile(r'\s+')
+    CJK_RE = re.compile(r'[\u4e00-\u9fa5]')
+    CJK_WORD_RE = re.compile(r'[\u4e00-\u9fa5]{2,}')
+    NUM_SYMBOL_RE = re.compile(r'^[\d\s!"#$%&\'()*+,-./:;<=>?@\[\]^_`{|}~。，、；：？！…—·ˉ¨〃々～‖∶＂＇｀｜〔〕〈〉《》「」『』．〖〗【】（）［］｛｝]+$')
+    SHORT_LINE_RE = re.compile(r'^[^，。！？\n]{1,10}$')
+    BLANK_LINES_RE = re.compile(r'\n{3,}')
+    
+    # 标题中常见的网站名称后缀
+    TITLE_SUFFIX_PATTERNS = [
+        r'\s*[-_]\s*Papers\s+with\s+Code\s*$',
+        r'\s*[-_]\s*\|\s*Papers\s+with\s+Code\s*$',
+        r'\s*\|\s*Papers\s+with\s+Code\s*$',
+        r'\s*[-_]\s*arXiv\s*$',
+        r'\s*[-_]\s*GitHub\s*$',
+        r'\s*[-_|]\s*.*?\.com\s*$',
+        r'\s*[-_|]\s*.*?\.org\s*$',
+    ]
+    TITLE_SUFFIX_RES = [re.compile(p, re.IGNORECASE) for p in TITLE_SUFFIX_PATTERNS]
+    # 上述后缀模式的并集（提取了公共前缀，略宽于并集），不匹配时无需逐个替换
+    TITLE_SUFFIX_ANY_RE = re.compile(
+        r'\s*[-_|]\s*(?:.*?\.(?:com|org)|(?:\|\s*)?Papers\s+with\s+Code|arXiv|GitHub)\s*$',
+        re.IGNORECASE
+    )
+    TITLE_ILLEGAL_RE = re.compile(r'[<>:"/\\|?*]')
+    
     # 要跳过的元素
     SKIP_CLASSES = {'copyright', 'related', 'advertisement', 'share', 'comment'}
     SKIP_TAGS = {'script', 'style', 'iframe', 'form'}
+    # 按空白分隔的完整类名匹配 SKIP_CLASSES，与 class 属性 split() 后取交集等价
+    SKIP_CLASS_RE = re.compile(
+        r'(?<!\S)(?:' + '|'.join(map(re.escape, sorted(SKIP_CLASSES))) + r')(?!\S)'
+    )
     
     @classmethod
-    @lru_cache(maxsize=128)
     def _extract_from_meta(cls, html: HTMLParser, field: str) -> str:
-        """从meta标签提取内容，使用缓存提高性能"""
+        """从meta标签提取内容"""
         for selector in cls.META_SELECTORS[field]:
             if elem := html.css_first(selector):
                 content = elem.attributes.get('content', '') or elem.text()
@@ -95,12 +285,13 @@ class ArticleExtractor:
     def extract_title(cls, html: HTMLParser, config: dict) -> str:
         """提取文章标题"""
         try:
+            selectors = ConfigSelectors.of(config)
             # 使用生成器优化提取逻辑
             extractors = (
                 lambda: cls._extract_from_meta(html, 'title'),
-                lambda: cls._extract_from_selectors(html, config.selectors.get('title', []) if hasattr(config, 'selectors') else []),
-                lambda: cls._extract_from_selectors(html, getattr(config, 'title_selectors', [])),
-                lambda: cls._extract_from_selectors(html, cls.COMMON_SELECTORS['title'])
+                lambda: cls._extract_from_selectors(html, selectors.legacy_title),
+                lambda: cls._extract_from_selectors(html, selectors.title, selectors.title_joined),
+                lambda: cls._extract_from_selectors(html, cls.COMMON_SELECTORS['title'], cls.COMMON_SELECTORS_JOINED['title'])
             )
             
             for extractor in extractors:
@@ -124,8 +315,10 @@ class ArticleExtractor:
     def extract_publish_date(cls, html: HTMLParser, config: dict, url: str) -> str:
         """提取发布日期"""
         try:
+            selectors = ConfigSelectors.of(config)
+            
             # 1. 从页面提取完整日期时间
-            date = cls._extract_from_selectors(html, cls.COMMON_SELECTORS['date'])
+            date = cls._extract_from_selectors(html, cls.COMMON_SELECTORS['date'], cls.COMMON_SELECTORS_JOINED['date'])
             if date:
                 normalized = DateExtractor.extract_date(date)
                 if normalized:
@@ -139,21 +332,21 @@ class ArticleExtractor:
                     return normalized
             
             # 3. 从配置的选择器提取(新格式)
-            if hasattr(config, 'selectors'):
-                selectors = getattr(config, 'selectors')
-                if isinstance(selectors, dict) and 'date' in selectors:
-                    date = cls._extract_from_selectors(html, [selectors['date']])
-                    if date:
-                        normalized = DateExtractor.extract_date(date)
-                        if normalized:
-                            return normalized
-                    # 如果配置中指定了日期格式
-                    if 'date_format' in selectors:
-                        return datetime.strptime(date.strip(), selectors['date_format'])
+            if selectors.legacy_date is not None:
+                date = cls._extract_from_selectors(html, [selectors.legacy_date])
+                if date:
+                    normalized = DateExtractor.extract_date(date)
+                    if normalized:
+                        return normalized
+                # 如果配置中指定了日期格式
+                if selectors.date_format is not None:
+                    if selectors.date_format == '%Y-%m-%d':
+                        return Article.parse_ymd(date.strip())
+                    return datetime.strptime(date.strip(), selectors.date_format)
             
             # 4. 从配置的选择器提取(旧格式)
-            if hasattr(config, 'date_selectors'):
-                date = cls._extract_from_selectors(html, config.date_selectors)
+            if selectors.date:
+                date = cls._extract_from_selectors(html, selectors.date, selectors.date_joined)
                 if date:
                     return DateExtractor.extract_date(date)
             
@@ -174,17 +367,24 @@ class ArticleExtractor:
         if arxiv_link:
             arxiv_url = arxiv_link.attributes['href']
             return arxiv_url.split('/')[-1]
-        else:
-            # 尝试从文本中提取
-            for elem in html.css('*'):
-                if text := elem.text():
-                    if match := re.search(r'arXiv:\s*(\d+\.\d+)', text):
-                        return match.group(1)
+        elif html.root is not None:
+            # 尝试从文本中提取：根节点的文本包含所有子节点的文本，一次搜索即可
+            text = html.root.text()
+            if 'arXiv:' in text and (match := cls.ARXIV_ID_RE.search(text)):
+                return match.group(1)
         return None
 
     @staticmethod
-    def _extract_from_selectors(html: HTMLParser, selectors: List[str]) -> str:
-        """从选择器���表中提取内容"""
+    def _extract_from_selectors(html: HTMLParser, selectors: List[str], joined_selector: Optional[str] = None) -> str:
+        """从选择器列表中提取内容
+        
+        joined_selector 为预先合并的选择器，未提供时按列表合并并缓存。整页无匹配时
+        一次遍历即可返回；有匹配时仍按列表顺序逐个尝试，保持选择器优先级。
+        """
+        if joined_selector is None and len(selectors) > 1:
+            joined_selector = _join_selectors(tuple(selectors))
+        if joined_selector and not html.css_first(joined_selector):
+            return ""
         for selector in selectors:
             if elem := html.css_first(selector):
                 text = elem.text()
@@ -207,25 +407,15 @@ class ArticleExtractor:
             return ""
         
         # 1. 基础清理
-        title = re.sub(r'[\n\r\t]', ' ', title)
-        title = ' '.join(title.split())  # 规范化空白字符
-        
-        # 2. 移除常见的网站名称后缀
-        remove_patterns = [
-            r'\s*[-_]\s*Papers\s+with\s+Code\s*$',
-            r'\s*[-_]\s*\|\s*Papers\s+with\s+Code\s*$',
-            r'\s*\|\s*Papers\s+with\s+Code\s*$',
-            r'\s*[-_]\s*arXiv\s*$',
-            r'\s*[-_]\s*GitHub\s*$',
-            r'\s*[-_|]\s*.*?\.com\s*$',
-            r'\s*[-_|]\s*.*?\.org\s*$',
-        ]
+        title = ' '.join(title.split())  # 换行、制表符等统一规范化为单个空格
         
-        for pattern in remove_patterns:
-            title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+        # 2. 移除常见的网站名称后缀，多数标题没有后缀，先用一次扫描排除
+        if ArticleExtractor.TITLE_SUFFIX_ANY_RE.search(title):
+            for pattern in ArticleExtractor.TITLE_SUFFIX_RES:
+                title = pattern.sub('', title)
         
         # 3. 移除不合法的文件名字符
-        title = re.sub(r'[<>:"/\\|?*]', '-', title)
+        title = ArticleExtractor.TITLE_ILLEGAL_RE.sub('-', title)
         
         # 4. 限制标题长度，避免文件名过长
         if len(title) > 200:
@@ -252,15 +442,9 @@ class ArticleExtractor:
     def extract_author(cls, html: HTMLParser, config: dict) -> str:
         """提取作者"""
         try:
-            # 处理配置对象
-            selectors = []
-            if hasattr(config, 'selectors') and isinstance(config.selectors, dict):
-                selectors = config.selectors.get('author', [])
-            elif isinstance(config, dict):
-                selectors = config.get('selectors', {}).get('author', [])
-                
+            selectors = ConfigSelectors.of(config).author
             if selectors:
-                author = cls._extract_from_selectors(html, [selectors] if isinstance(selectors, str) else selectors)
+                author = cls._extract_from_selectors(html, selectors)
                 if author:
                     return author
             
@@ -274,11 +458,8 @@ class ArticleExtractor:
     def extract_category(cls, html: HTMLParser, config: dict) -> str:
         """提取文章分类"""
         try:
-            # 检查配置中是否有分类选择器
-            if not hasattr(config, 'category_selectors') or not config.category_selectors:
-                return ""
-            
-            for selector in config.category_selectors:
+            # 配置中没有分类选择器时为空列表
+            for selector in ConfigSelectors.of(config).category:
                 if elem := html.css_first(selector):
                     category = elem.text().strip()
                     # 清理分类名称
@@ -294,14 +475,12 @@ class ArticleExtractor:
     def extract_content(cls, html: HTMLParser, config: dict) -> str:
         """提取文章正文"""
         try:
-            # 处理配置对象
-            selectors = []
-            if hasattr(config, 'content_selectors'):
-                selectors = config.content_selectors
-            elif hasattr(config, 'selectors') and isinstance(config.selectors, dict):
-                selectors = config.selectors.get('content', [])
-            elif isinstance(config, dict):
-                selectors = config.get('content_selectors', [])
+            config_selectors = ConfigSelectors.of(config)
+            selectors = config_selectors.content
+            # 合并选择器无匹配时跳过逐个选择器的遍历
+            joined_selector = config_selectors.content_joined
+            if joined_selector and not html.css_first(joined_selector):
+                selectors = []
             
             content_parts = []
             seen_content = set()
@@ -325,16 +504,15 @@ class ArticleExtractor:
     @classmethod
     def _should_skip_element(cls, elem: HTMLParser) -> bool:
         """判断是否应该跳过个素"""
-        # 跳过包含特定类名的元素
-        if elem.attributes.get('class'):
-            elem_classes = set(elem.attributes['class'].split())
-            if elem_classes & cls.SKIP_CLASSES:
-                return True
-        
         # 跳过特定标签
         if elem.tag in cls.SKIP_TAGS:
             return True
         
+        # 跳过包含特定类名的元素
+        elem_class = elem.attributes.get('class')
+        if elem_class and cls.SKIP_CLASS_RE.search(elem_class):
+            return True
+        
         return False
     
     @classmethod
@@ -343,96 +521,20 @@ class ArticleExtractor:
         if not content:
             return ""
         
-        # 1. 移除 JavaScript 代码块和样式
-        js_patterns = [
-            r'<script[\s\S]*?</script>',  # script标签及内容
-            r'<style[\s\S]*?</style>',    # style标签及内容
-            r'var\s+.*?;',                # 变量声明
-            r'function\s*.*?{[\s\S]*?}',  # 函数定义
-            r'\(sinaads\s*=.*?\);',       # 广告代码
-            r'\(\s*function\s*\(\s*\)[\s\S]*?\}\s*\)\s*\(\s*\);', # 自执行函数
-            r'\.[\w-]+\s*{[^}]*}',        # CSS类定义
-            r'#[\w-]+\s*{[^}]*}',         # CSS ID定义
-            r'//.*?(?:\n|$)',             # 单行注释
-            r'/\*[\s\S]*?\*/',            # 多行注释
-        ]
-        
-        for pattern in js_patterns:
-            content = re.sub(pattern, '', content, flags=re.MULTILINE|re.IGNORECASE)
-        
-        # 2. 移除 HTML 标签和属性
-        html_patterns = [
-            r'<[^>]+>',                   # HTML标签
-            r'&[a-zA-Z0-9]+;',           # HTML实体
-            r'\.appendQr_wrap.*?(?:\n|$)', # 特定的HTML类
-            r'\.mag_topad.*?(?:\n|$)',     # 广告相关类
-            r'\.news_lt.*?(?:\n|$)',       # 新闻相关类
-            r'\.vip-class.*?(?:\n|$)',     # VIP相关类
-        ]
-        
-        for pattern in html_patterns:
-            content = re.sub(pattern, '', content, flags=re.MULTILINE)
-        
-        # 3. 移除文章元信息
-        meta_patterns = [
-            r'\(编辑[：:]\s*.*?\)',
-            r'\(记者[：:]\s*.*?\)',
-            r'作者[：:]\s*.*?(?:\n|$)',
-            r'来源[：:]\s*.*?(?:\n|$)',
-            r'本来源.*?(?:\n|$)',
-            r'原文链接.*?(?:\n|$)',
-            r'关键字[：:]\s*.*?(?:\n|$)',
-            r'责任编辑.*?(?:\n|$)',
-            r'编辑[：:]\s*.*?(?:\n|$)',
-            r'本文来源于.*?(?:\n|$)',
-        ]
-        
-        for pattern in meta_patterns:
-            content = re.sub(pattern, '', content, flags=re.MULTILINE)
-        
-        # 4. 移除导航和位置信息
-        nav_patterns = [
-            r'当前位置：.*?(?:\n|$)',
-            r'返回首页.*?(?:\n|$)',
-            r'举报.*?(?:\n|$)',
-            r'分享到：.*?(?:\n|$)',
-            r'相关专题：.*?(?:\n|$)',
-            r'相关新闻：.*?(?:\n|$)',
-            r'热门推荐.*?(?:\n|$)',
-            r'合作伙伴.*?(?:\n|$)',
-            r'友情链接.*?(?:\n|$)',
-        ]
-        
-        for pattern in nav_patterns:
-            content = re.sub(pattern, '', content, flags=re.MULTILINE)
-        
-        # 5. 移除广告和推广
-        ad_patterns = [
-            r'更多精彩内容.*?(?:\n|$)',
-            r'关注.*?获取更多.*?(?:\n|$)',
-            r'点击关注.*?(?:\n|$)',
-            r'https?://\S+',             # URL
-            r'APP专享.*?(?:\n|$)',
-            r'扫描二维码.*?(?:\n|$)',
-            r'海量资讯.*?(?:\n|$)',
-            r'热门文章.*?(?:\n|$)',
-            r'编辑推荐.*?(?:\n|$)',
-        ]
-        
-        for pattern in ad_patterns:
-            content = re.sub(pattern, '', content, flags=re.MULTILINE)
+        # 1-5. 依次移除脚本样式、HTML标签、元信息、导航和广告
+        for pattern in cls.CLEAN_RES:
+            content = pattern.sub('', content)
         
         # 6. 处理段落
-        paragraphs = content.split('\n')[:MAX_LINES_DOWNLOADED]
         unique_paragraphs = []
         seen_content = set()
         valid_content_found = False  # 标记是否找到有效正文内容
         empty_line_count = 0  # 连续空行计数
         
-        for para in paragraphs:
+        for para in _iter_lines(content, MAX_LINES_DOWNLOADED):
             # 清理段落
             para = para.strip()
-            para = re.sub(r'\s+', ' ', para)  # 合并多个空白字符
+            para = cls.WHITESPACE_RE.sub(' ', para)  # 合并多个空白字符
             
             # 计算连续空行
             if not para:
@@ -453,27 +555,26 @@ class ArticleExtractor:
                 continue
             
             # 跳过疑似代码或样式内容
-            if any(x in para.lower() for x in [
-                'function', 'var ', 'document.', 'window.', 
-                '{', '}', ';', 'javascript', '.css', '#',
-                '@', '==', '++', '--'
-            ]):
+            if cls.CODE_MARKER_RE.search(para):
                 continue
             
+            # 是否包含中文，后续判断共用一次扫描的结果
+            has_cjk = cls.CJK_RE.search(para) is not None
+            
             # 跳过无意义的短句
-            if len(para) < 10 and not re.search(r'[\u4e00-\u9fa5]', para):
+            if len(para) < 10 and not has_cjk:
                 continue
             
             # 跳过纯数字或符号的行
-            if re.match(r'^[\d\s!"#$%&\'()*+,-./:;<=>?@\[\]^_`{|}~。，、；：？！…—·ˉ¨〃々～‖∶＂＇｀｜〔〕〈〉《》「」『』．〖〗【】（）［］｛｝]+$', para):
+            if cls.NUM_SYMBOL_RE.match(para):
                 continue
             
             # 跳过导航菜单项
-            if re.match(r'^[^，。！？\n]{1,10}$', para) and not re.search(r'[\u4e00-\u9fa5]{2,}', para):
+            if cls.SHORT_LINE_RE.match(para) and not cls.CJK_WORD_RE.search(para):
                 continue
             
             # 如果包含中文,标记为找到有效正文内容
-            if re.search(r'[\u4e00-\u9fa5]', para):
+            if has_cjk:
                 valid_content_found = True
             
             seen_content.add(para)
@@ -483,8 +584,8 @@ class ArticleExtractor:
         cleaned_text = '\n'.join(unique_paragraphs)
         
         # 8. 最后的清理
-        cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)  # 移除多余的空行
-        cleaned_text = re.sub(r'^\s+|\s+$', '', cleaned_text)   # 移除首尾空白
+        cleaned_text = cls.BLANK_LINES_RE.sub('\n\n', cleaned_text)  # 移除多余的空行
+        cleaned_text = cleaned_text.strip()   # 移除首尾空白
         
         return cleaned_text
 
@@ -493,15 +594,12 @@ class Article(ABC):
     
     def __init__(self, url: str, html: str, config: dict = None):
         self.url = url
-        # 统一使用 HTMLParser
-        if isinstance(html, HTMLParser):
-            self.html_parser = html
-            self.html = html.html
-        else:
-            self.html = html
-            self.html_parser = HTMLParser(html)
+        # 统一使用 HTMLParser，传入已解析的 DOM 时直接复用；不保留原始HTML字符串
+        self.html_parser = html if isinstance(html, HTMLParser) else HTMLParser(html)
             
         self.config = config or {}
+        # 整理一次配置中的选择器，供各个提取方法使用
+        self.selectors = ConfigSelectors(self.config)
         
         # 基本属性
         self.title: str = ""
@@ -515,6 +613,11 @@ class Article(ABC):
         except Exception as e:
             logging.getLogger(__name__).error(f"解析文章失败: {str(e)}")
 
+    @cached_property
+    def html(self) -> str:
+        """页面HTML，首次访问时由 DOM 序列化"""
+        return self.html_parser.html
+
     def parse(self):
         """解析文章，调用子类实现的_parse方法"""
         if hasattr(self, '_parse'):
@@ -562,13 +665,24 @@ class Article(ABC):
     def is_article_within_days(self, date_str: str, days: int = 7) -> bool:
         """检查文章日期是否在指定天数内"""
         try:
-            article_date = datetime.strptime(date_str, '%Y-%m-%d')
+            article_date = self.parse_ymd(date_str)
             today = datetime.now()
             delta = today - article_date
             return delta.days <= days
         except ValueError:
             return False
 
+    @staticmethod
+    def parse_ymd(date_str: str) -> datetime:
+        """
+        解析 YYYY-MM-DD 格式的日期，直接拆分为整数，比 strptime 快一个数量级
+        
+        Raises:
+            ValueError: 格式或日期无效时抛出
+        """
+        year, month, day = map(int, date_str.split('-'))
+        return datetime(year, month, day)
+
     @staticmethod
     def is_within_retention_period(date: datetime, retention_days: int) -> bool:
         """
@@ -0,0 +1,76 @@
+import hashlib
+import math
+from typing import List, Tuple
+
+class BloomFilter:
+    """可扩容的布隆过滤器，用于大规模URL去重
+
+    每个URL只占用约 10~20 bit，存在极小的误判率（判定为已存在），不会漏判。
+    容量用满后追加一个容量翻倍、误判率减半的新分片，整体误判率不超过 error_rate 的两倍。
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 1e-4):
+        """初始化布隆过滤器
+
+        Args:
+            capacity: 第一个分片的容量
+            error_rate: 第一个分片的误判率
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # 每个分片: [位数组, 位数, 哈希函数个数, 容量, 已添加数]
+        self._slices: List[list] = []
+        self._count = 0
+        self._add_slice(capacity, error_rate)
+
+    def _add_slice(self, capacity: int, error_rate: float):
+        """追加一个新的分片"""
+        num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self._slices.append([bytearray((num_bits + 7) // 8), num_bits, num_hashes, capacity, 0])
+
+    @staticmethod
+    def _hash(item: str) -> Tuple[int, int]:
+        """计算两个64位哈希值，用于双重哈希生成各个位置"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    @staticmethod
+    def _contains(bloom_slice: list, h1: int, h2: int) -> bool:
+        bits, num_bits, num_hashes = bloom_slice[0], bloom_slice[1], bloom_slice[2]
+        for i in range(num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def __contains__(self, item: str) -> bool:
+        h1, h2 = self._hash(item)
+        return any(self._contains(bloom_slice, h1, h2) for bloom_slice in self._slices)
+
+    def add(self, item: str) -> bool:
+        """添加元素
+
+        Returns:
+            bool: 元素是新添加的返回True，已存在（或误判为已存在）返回False
+        """
+        h1, h2 = self._hash(item)
+        if any(self._contains(bloom_slice, h1, h2) for bloom_slice in self._slices):
+            return False
+
+        bloom_slice = self._slices[-1]
+        bits, num_bits, num_hashes = bloom_slice[0], bloom_slice[1], bloom_slice[2]
+        for i in range(num_hashes):
+            pos = (h1 + i * h2) % num_bits
+            bits[pos >> 3] |= 1 << (pos & 7)
+        bloom_slice[4] += 1
+        self._count += 1
+
+        # 当前分片已满，追加容量翻倍、误判率减半的新分片
+        if bloom_slice[4] >= bloom_slice[3]:
+            self._add_slice(bloom_slice[3] * 2, self.error_rate / (2 ** len(self._slices)))
+        return True
+
+    def __len__(self) -> int:
+        """已添加的元素个数"""
+        return self._count
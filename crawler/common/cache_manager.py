@@ -1,51 +1,174 @@
 import os
 import json
+import hashlib
+import threading
 from datetime import datetime
-from typing import Dict, Set
+from typing import Dict, List, Optional, Set
 import logging
 
+def _url_fingerprint(url: str) -> int:
+    """URL的稳定64位指纹，跨进程一致，可持久化"""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
 class CacheManager:
+    """已保存文章URL的缓存，只保存URL的64位指纹而非完整字符串"""
+    
+    # 追加日志累计的条数达到该值时合并到主缓存文件
+    COMPACT_THRESHOLD = 10000
+    
     def __init__(self, cache_dir: str = "data/cache"):
         self.cache_dir = cache_dir
         self.logger = logging.getLogger(__name__)
-        self.url_cache: Dict[str, Set[str]] = {}  # domain -> set of cached URLs
-        self.cache_file = os.path.join(cache_dir, "url_cache.json")
+        self.url_cache: Dict[str, Set[int]] = {}  # domain -> set of cached URL fingerprints
+        self.cache_file = os.path.join(cache_dir, "url_fingerprints.json")
+        # 旧版本保存完整URL的缓存文件，首次加载时迁移
+        self.legacy_cache_file = os.path.join(cache_dir, "url_cache.json")
+        # 新增的URL逐行追加到日志文件，定期合并到主缓存文件
+        self.log_file = self.cache_file + ".log"
+        # 后台合并期间旧日志改名为待合并日志，合并成功后删除
+        self.pending_log_file = self.log_file + ".pending"
+        self._saver: Optional[threading.Thread] = None
+        self._total = 0
+        self._log_count = 0
+        # 从旧版本缓存文件迁移而来，尚未写入主缓存文件
+        self._migrated = False
         
         # 创建缓存目录
         os.makedirs(cache_dir, exist_ok=True)
         
         # 加载现有缓存
         self._load_cache()
+        self._log = open(self.log_file, 'a', encoding='utf-8', buffering=1)
+        # 上次运行的后台合并未完成，启动时先同步合并
+        if os.path.exists(self.pending_log_file):
+            self.compact()
         
     def _load_cache(self):
-        """从文件加载缓存"""
+        """从主缓存文件加载缓存，再重放追加日志"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
+            # 新缓存文件不存在时从旧版本的URL缓存迁移
+            cache_file = self.cache_file
+            if not os.path.exists(cache_file) and os.path.exists(self.legacy_cache_file):
+                cache_file = self.legacy_cache_file
+            if os.path.exists(cache_file):
+                with open(cache_file, 'r', encoding='utf-8') as f:
                     cache_data = json.load(f)
-                    # 将JSON中的列表转换为集合
+                    # 将JSON中的列表转换为集合，旧版本中的URL字符串转换为指纹
                     self.url_cache = {
-                        domain: set(urls) 
+                        domain: {
+                            _url_fingerprint(url) if isinstance(url, str) else url
+                            for url in urls
+                        }
                         for domain, urls in cache_data.items()
                     }
-                self.logger.info(f"已加载缓存，共 {sum(len(urls) for urls in self.url_cache.values())} 个URL")
+                # 迁移结果在第一次合并或关闭时写入主缓存文件，之后不再读取旧文件
+                self._migrated = cache_file == self.legacy_cache_file
         except Exception as e:
             self.logger.error(f"加载缓存失败: {str(e)}")
             self.url_cache = {}
+        
+        for log_file in (self.pending_log_file, self.log_file):
+            try:
+                if os.path.exists(log_file):
+                    with open(log_file, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            try:
+                                entry = json.loads(line)
+                            except ValueError:
+                                # 进程中断时最后一行可能不完整
+                                continue
+                            self.url_cache.setdefault(entry['d'], set()).add(entry['h'])
+                            if log_file == self.log_file:
+                                self._log_count += 1
+            except Exception as e:
+                self.logger.error(f"加载缓存日志失败: {str(e)}")
+        
+        self._total = sum(len(urls) for urls in self.url_cache.values())
+        if self._total:
+            self.logger.info(f"已加载缓存，共 {self._total} 个URL")
             
-    def _save_cache(self):
-        """保存缓存到文件"""
+    def _snapshot(self) -> Dict[str, List[int]]:
+        """复制当前缓存，将集合转换为列表以便JSON序列化"""
+        return {
+            domain: list(urls) 
+            for domain, urls in self.url_cache.items()
+        }
+        
+    def _save_cache(self, cache_data: Optional[Dict[str, List[int]]] = None) -> bool:
+        """保存缓存到文件，cache_data 为空时保存当前缓存"""
         try:
-            # 将集合转换为列表以便JSON序列化
-            cache_data = {
-                domain: list(urls) 
-                for domain, urls in self.url_cache.items()
-            }
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            if cache_data is None:
+                cache_data = self._snapshot()
+            # 先写临时文件再替换，避免写入中断损坏缓存
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache_data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
             self.logger.debug("缓存已保存到文件")
+            return True
         except Exception as e:
             self.logger.error(f"保存缓存失败: {str(e)}")
+            return False
+            
+    def compact(self):
+        """将追加日志同步合并到主缓存文件并清空日志"""
+        if self._saver is not None:
+            self._saver.join()
+            self._saver = None
+        pending = os.path.exists(self.pending_log_file)
+        if (self._log_count or pending or self._migrated) and self._save_cache():
+            self._log.truncate(0)
+            self._log_count = 0
+            self._migrated = False
+            if pending:
+                self._remove_pending_log()
+                
+    def _compact_in_background(self):
+        """
+        在后台线程中合并日志，不阻塞调用方
+        
+        在当前线程中复制缓存并将日志改名为待合并日志，之后新增的URL写入新的日志文件；
+        后台线程写入主缓存文件后删除待合并日志。
+        """
+        if self._saver is not None and self._saver.is_alive():
+            return
+        if os.path.exists(self.pending_log_file):
+            # 上次后台合并失败，待合并日志不能被覆盖，改为同步合并
+            self.compact()
+            return
+        
+        snapshot = self._snapshot()
+        self._log.close()
+        os.replace(self.log_file, self.pending_log_file)
+        self._log = open(self.log_file, 'a', encoding='utf-8', buffering=1)
+        self._log_count = 0
+        self._migrated = False
+        
+        self._saver = threading.Thread(
+            target=self._save_snapshot, args=(snapshot,), name="cache-saver")
+        self._saver.start()
+        
+    def _save_snapshot(self, snapshot: Dict[str, List[int]]):
+        """后台线程: 保存缓存副本，成功后删除已合并的待合并日志"""
+        if self._save_cache(snapshot):
+            self._remove_pending_log()
+            
+    def _remove_pending_log(self):
+        try:
+            os.remove(self.pending_log_file)
+        except OSError as e:
+            self.logger.error(f"删除待合并日志失败: {str(e)}")
+            
+    def flush(self):
+        """将追加日志写入磁盘"""
+        if not self._log.closed:
+            self._log.flush()
+            
+    def close(self):
+        """等待后台合并完成，合并剩余日志并关闭日志文件"""
+        if not self._log.closed:
+            self.compact()
+            self._log.close()
             
     def init_domain(self, domain: str):
         """初始化域名的缓存"""
@@ -54,20 +177,25 @@ class CacheManager:
             
     def is_cached(self, url: str, domain: str) -> bool:
         """检查URL是否已经缓存"""
-        return url in self.url_cache.get(domain, set())
+        return _url_fingerprint(url) in self.url_cache.get(domain, ())
         
     def add_to_cache(self, url: str, domain: str):
         """添加URL到缓存"""
-        if domain not in self.url_cache:
-            self.url_cache[domain] = set()
-        self.url_cache[domain].add(url)
+        fingerprints = self.url_cache.setdefault(domain, set())
+        fingerprint = _url_fingerprint(url)
+        if fingerprint in fingerprints:
+            return
+        fingerprints.add(fingerprint)
+        self._total += 1
         
-        # 定期保存缓存（比如每100个URL保存一次）
-        if sum(len(urls) for urls in self.url_cache.values()) % 100 == 0:
-            self._save_cache()
+        # 只追加一行日志，不重写整个缓存文件
+        self._log.write(json.dumps({'d': domain, 'h': fingerprint}, ensure_ascii=False) + '\n')
+        self._log_count += 1
+        if self._log_count >= self.COMPACT_THRESHOLD:
+            self._compact_in_background()
             
     def get_cache_size(self, domain: str = None) -> int:
         """获取缓存大小"""
         if domain:
             return len(self.url_cache.get(domain, set()))
-        return sum(len(urls) for urls in self.url_cache.values()) 
\ No newline at end of file
+        return self._total
@@ -2,7 +2,6 @@ from datetime import datetime, timedelta
 from typing import Optional, List, Tuple, Pattern, Union
 import re
 import logging
-from functools import lru_cache
 
 class DateExtractor:
     """日期提取器,用于从文本中提取日期并标准化格式"""
@@ -35,18 +34,29 @@ class DateExtractor:
         (re.compile(r'(\d{2})/(\d{2})/(\d{2})'), '%y/%m/%d'),  # 24/03/22
     ]
     
-    # 相对时间模式
-    RELATIVE_PATTERNS = [
-        (re.compile(r'(\d+)\s*分钟前'), lambda m: datetime.now() - timedelta(minutes=int(m.group(1)))),
-        (re.compile(r'(\d+)\s*小时前'), lambda m: datetime.now() - timedelta(hours=int(m.group(1)))),
-        (re.compile(r'(\d+)\s*天前'), lambda m: datetime.now() - timedelta(days=int(m.group(1)))),
-        (re.compile(r'昨天'), lambda m: datetime.now() - timedelta(days=1)),
-        (re.compile(r'前天'), lambda m: datetime.now() - timedelta(days=2)),
-        (re.compile(r'刚刚'), lambda m: datetime.now()),
+    # 每个模式中英文月份名所在的分组位置，None 表示纯数字格式
+    _MONTH_NAME_INDEX: List[Optional[int]] = [
+        date_format.split().index('%b') if '%b' in date_format else None
+        for _, date_format in PATTERNS
+    ]
+    
+    # 上述模式都至少包含一个数字，没有数字的文本无需逐个匹配
+    _DIGIT_RE = re.compile(r'\d')
+    # 任何可识别的日期都至少包含数字或"前/昨/刚"之一
+    _DATE_HINT_RE = re.compile(r'[\d前昨刚]')
+    _PREFIX_RE = re.compile(r'^(发布于|发表于|Published on|Posted on|Date:)\s*', re.IGNORECASE)
+    
+    # 相对时间模式: (模式, 时间单位)，有分组时偏移量为 单位 × 分组中的数字
+    RELATIVE_PATTERNS: List[Tuple[Pattern, timedelta]] = [
+        (re.compile(r'(\d+)\s*分钟前'), timedelta(minutes=1)),
+        (re.compile(r'(\d+)\s*小时前'), timedelta(hours=1)),
+        (re.compile(r'(\d+)\s*天前'), timedelta(days=1)),
+        (re.compile(r'昨天'), timedelta(days=1)),
+        (re.compile(r'前天'), timedelta(days=2)),
+        (re.compile(r'刚刚'), timedelta(0)),
     ]
     
     @classmethod
-    @lru_cache(maxsize=128)
     def extract_date(cls, text: str, return_str: bool = False) -> Optional[Union[datetime, str]]:
         """
         从文本中提取日期并转换为datetime对象或标准化的日期字符串
@@ -58,66 +68,66 @@ class DateExtractor:
         Returns:
             datetime对象 或 YYYY-MM-DD格式的字符串，解析失败则返回None
         """
-        if not text:
+        if not text or not cls._DATE_HINT_RE.search(text):
             return None
             
         # 清理文本
         text = ' '.join(text.split())
-        text = re.sub(r'^(发布于|发表于|Published on|Posted on|Date:)\s*', '', text, flags=re.IGNORECASE)
+        text = cls._PREFIX_RE.sub('', text)
         
         result = None
+        # 同一次解析只取一次当前时间
+        now = datetime.now()
         
         # 1. 处理相对时间
-        for pattern, time_func in cls.RELATIVE_PATTERNS:
+        for pattern, unit in cls.RELATIVE_PATTERNS:
             if match := pattern.search(text):
                 try:
-                    result = time_func(match)
+                    result = now - (unit * int(match.group(1)) if pattern.groups else unit)
                     break
-                except (ValueError, AttributeError):
+                except (ValueError, OverflowError):
                     continue
         
         # 2. 处理标准格式
-        if not result:
-            for pattern, date_format in cls.PATTERNS:
-                if match := pattern.search(text):
-                    try:
-                        parts = match.groups()
-                        
-                        # 处理英文月份名称
-                        if re.match(r'[A-Za-z]', str(parts[0])):  # 月份在第一个位置
-                            month_str = parts[0][:3].title()
-                            if month_str not in cls.MONTH_MAP:
-                                continue
-                            month = cls.MONTH_MAP[month_str]
-                            day = int(parts[1])
-                            year = int(parts[2]) if len(parts) > 2 else datetime.now().year
-                        elif re.match(r'[A-Za-z]', str(parts[1])):  # 月份在第二个位置
-                            month_str = parts[1][:3].title()
-                            if month_str not in cls.MONTH_MAP:
-                                continue
-                            month = cls.MONTH_MAP[month_str]
-                            day = int(parts[0])
-                            year = int(parts[2]) if len(parts) > 2 else datetime.now().year
-                        else:  # 标准数字格式
-                            year = int(parts[0])
-                            month = int(parts[1])
-                            day = int(parts[2])
-                        
-                        # 验证日期
-                        if not (1 <= month <= 12 and 1 <= day <= 31):
-                            continue
-                            
-                        # 处理两位数年份
-                        if year < 100:
-                            year += 2000
-                        
-                        result = datetime(year, month, day)
-                        break
-                            
-                    except (ValueError, IndexError) as e:
-                        logging.debug(f"解析日期失败: {str(e)}")
-                        continue
+        if not result and cls._DIGIT_RE.search(text):
+            result = cls._parse_absolute(text, now.year)
         
         if result and return_str:
-            return result.strftime('%Y-%m-%d')
-        return result 
+            return result.date().isoformat()
+        return result
+    
+    @classmethod
+    def _parse_absolute(cls, text: str, current_year: int) -> Optional[datetime]:
+        """按标准格式解析清理后的日期文本，省略年份时使用 current_year"""
+        for (pattern, _), month_index in zip(cls.PATTERNS, cls._MONTH_NAME_INDEX):
+            if match := pattern.search(text):
+                try:
+                    parts = match.groups()
+                    
+                    # 处理英文月份名称
+                    if month_index is not None:
+                        month_str = parts[month_index][:3].title()
+                        if month_str not in cls.MONTH_MAP:
+                            continue
+                        month = cls.MONTH_MAP[month_str]
+                        day = int(parts[1 - month_index])
+                        year = int(parts[2]) if len(parts) > 2 else current_year
+                    else:  # 标准数字格式
+                        year = int(parts[0])
+                        month = int(parts[1])
+                        day = int(parts[2])
+                    
+                    # 验证日期
+                    if not (1 <= month <= 12 and 1 <= day <= 31):
+                        continue
+                        
+                    # 处理两位数年份
+                    if year < 100:
+                        year += 2000
+                    
+                    return datetime(year, month, day)
+                        
+                except (ValueError, IndexError) as e:
+                    logging.debug(f"解析日期失败: {str(e)}")
+                    continue
+        return None
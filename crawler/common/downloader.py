@@ -5,25 +5,61 @@ import httpx
 from typing import Optional, Dict
 from urllib.parse import urlparse
 
-class NetworkError(Exception):
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+class DownloaderError(Exception):
+    """下载器错误"""
+    pass
+
+class NetworkError(DownloaderError):
     """网络错误"""
     pass
 
+class SSLError(DownloaderError):
+    """SSL错误"""
+    pass
+
+class ResponseTooLargeError(NetworkError):
+    """响应体超过大小上限"""
+    pass
+
 class Downloader:
     """异步下载器"""
     
-    def __init__(self, retry_times: int = 3, retry_interval: int = 1, timeout: int = 10, **kwargs):
+    # 值得重试的HTTP状态码，其他错误状态码（如404）重试也不会成功
+    RETRY_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+    # 重试间隔上限（秒）
+    MAX_RETRY_DELAY = 30.0
+    
+    def __init__(self, retry_times: int = 3, retry_interval: int = 1, timeout: int = 10,
+                 http2: bool = True, max_bytes: int = 5 * 1024 * 1024,
+                 per_host_delay: float = 0.0, global_concurrency: int = 0, **kwargs):
         """初始化下载器
         
         Args:
             retry_times: 重试次数
             retry_interval: 重试间隔（秒）
             timeout: 超时时间（秒）
+            http2: 是否启用HTTP/2（需要安装 h2，未安装时自动使用HTTP/1.1）
+            max_bytes: 响应体大小上限（字节），超过时放弃该页面
+            per_host_delay: 同一站点相邻两次请求的最小间隔（秒），0 表示不限制；不同站点互不影响
+            global_concurrency: 所有站点同时进行的请求数上限，0 表示不限制
             **kwargs: 其他配置参数（将被忽略）
         """
         self.retry_times = retry_times
         self.retry_interval = retry_interval
         self.timeout = timeout
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.max_bytes = max_bytes
+        self.per_host_delay = per_host_delay
+        # scheme://host -> 该站点的等待锁和下次允许请求的时间
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_next_ok: Dict[str, float] = {}
+        self._semaphore = asyncio.Semaphore(global_concurrency) if global_concurrency > 0 else None
         self.session: Optional[httpx.AsyncClient] = None
         self.logger = logging.getLogger(__name__)
         
@@ -34,11 +70,14 @@ class Downloader:
             'Accept-Language': 'en-US,en;q=0.5',
         }
         
-        # 连接池配置
+        # scheme://host -> 合并了 Host、Referer 的请求头
+        self._header_cache: Dict[str, Dict[str, str]] = {}
+        
+        # 连接池配置：所有站点的工作协程共用同一个连接池
         self.limits = httpx.Limits(
-            max_keepalive_connections=10,
-            max_connections=50,
-            keepalive_expiry=30.0
+            max_keepalive_connections=50,
+            max_connections=200,
+            keepalive_expiry=300.0
         )
         
         # 超时配置
@@ -53,7 +92,12 @@ class Downloader:
         """获取或创建会话"""
         if self.session is None or self.session.is_closed:
             self.session = httpx.AsyncClient(
-                limits=self.limits,
+                # 建立连接失败时由传输层直接重试，不占用下面的重试次数
+                transport=httpx.AsyncHTTPTransport(
+                    http2=self.http2,
+                    limits=self.limits,
+                    retries=2
+                ),
                 timeout=self.timeout_config,
                 follow_redirects=True
             )
@@ -65,6 +109,93 @@ class Downloader:
             await self.session.aclose()
             self.session = None
     
+    @staticmethod
+    def _site_key(url: str) -> str:
+        """取URL的 scheme://host 部分作为站点键，无需每次请求都解析URL"""
+        end = url.find('/', url.find('//') + 2)
+        return url if end < 0 else url[:end]
+    
+    def _headers_for(self, url: str) -> Dict[str, str]:
+        """获取URL所在站点的请求头，同一站点只构建一次"""
+        key = self._site_key(url)
+        headers = self._header_cache.get(key)
+        if headers is None:
+            headers = {**self.headers}  # 复制默认headers
+            
+            # 添加域名相关的headers
+            parsed = urlparse(key)
+            domain = parsed.netloc
+            if domain:
+                headers.update({
+                    'Host': domain,
+                    'Referer': f"{parsed.scheme}://{domain}/"
+                })
+            if len(self._header_cache) >= 256:
+                self._header_cache.clear()
+            self._header_cache[key] = headers
+        return headers
+    
+    async def _wait_for_host(self, url: str):
+        """等待到该站点允许下一次请求的时间，不同站点的请求互不等待"""
+        if self.per_host_delay <= 0:
+            return
+        key = self._site_key(url)
+        lock = self._host_locks.get(key)
+        if lock is None:
+            lock = self._host_locks[key] = asyncio.Lock()
+        # 只在等待期间持有锁，同一站点的请求按间隔依次发出，请求本身可以并发
+        async with lock:
+            loop = asyncio.get_running_loop()
+            wait = self._host_next_ok.get(key, 0.0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_next_ok[key] = loop.time() + self.per_host_delay
+    
+    @classmethod
+    def _parse_retry_after(cls, response: httpx.Response) -> Optional[float]:
+        """解析 Retry-After 头中的秒数，不超过重试间隔上限；没有或为日期格式时返回None"""
+        try:
+            return min(cls.MAX_RETRY_DELAY, max(0.0, float(response.headers['Retry-After'])))
+        except (KeyError, ValueError):
+            return None
+    
+    async def _read_limited(self, response: httpx.Response) -> bytes:
+        """分块读取响应体，超过 max_bytes 时立即停止"""
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise ResponseTooLargeError(f"响应体过大 ({content_length} 字节): {response.url}")
+        
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes(64 * 1024):
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise ResponseTooLargeError(f"响应体超过 {self.max_bytes} 字节: {response.url}")
+            chunks.append(chunk)
+        return b''.join(chunks)
+    
+    async def _request(self, session: httpx.AsyncClient, url: str,
+                       headers: Dict[str, str], **kwargs) -> httpx.Response:
+        """发送一次GET请求并读取响应体"""
+        # 以流的方式读取，响应体过大时不必整体读入内存
+        async with session.stream('GET', url, headers=headers, **kwargs) as response:
+            response.raise_for_status()
+            content = await self._read_limited(response)
+        # 读取到的响应体已按 Content-Encoding 解压，用公开的构造函数生成带完整响应体的响应，
+        # 去掉不再适用的 Content-Encoding 和 Content-Length，其余属性与原响应相同
+        headers = httpx.Headers([
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in ('content-encoding', 'content-length')
+        ])
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=content,
+            request=response.request,
+            history=response.history,
+            extensions=response.extensions,
+        )
+    
     async def get(self, url: str, **kwargs) -> Optional[httpx.Response]:
         """发送GET请求
         
@@ -78,24 +209,26 @@ class Downloader:
         Raises:
             NetworkError: 网络相关错误
         """
-        headers = {**self.headers}  # 复制默认headers
-        
-        # 添加域名相关的headers
-        parsed = urlparse(url)
-        domain = parsed.netloc
-        if domain:
-            headers.update({
-                'Host': domain,
-                'Referer': f"{parsed.scheme}://{domain}/"
-            })
+        headers = self._headers_for(url)
+        if extra_headers := kwargs.pop('headers', None):
+            headers = {**headers, **extra_headers}
         
         last_error = None
         for attempt in range(self.retry_times):
+            retry_after = None
             try:
+                await self._wait_for_host(url)
                 session = await self.get_session()
-                response = await session.get(url, headers=headers, **kwargs)
-                response.raise_for_status()
-                return response
+                if self._semaphore is None:
+                    return await self._request(session, url, headers, **kwargs)
+                async with self._semaphore:
+                    return await self._request(session, url, headers, **kwargs)
+                
+            except ResponseTooLargeError as e:
+                # 重试也不会变小，直接放弃
+                self.logger.warning(str(e))
+                last_error = e
+                break
                 
             except httpx.TimeoutException as e:
                 error_msg = f"连接超时 (尝试 {attempt + 1}/{self.retry_times}): {url}"
@@ -103,21 +236,25 @@ class Downloader:
                 last_error = NetworkError(error_msg)
                 
             except httpx.HTTPStatusError as e:
-                error_msg = f"HTTP错误 {e.response.status_code} (尝试 {attempt + 1}/{self.retry_times}): {url}"
+                status_code = e.response.status_code
+                error_msg = f"HTTP错误 {status_code} (尝试 {attempt + 1}/{self.retry_times}): {url}"
                 self.logger.warning(error_msg)
                 last_error = NetworkError(error_msg)
+                if status_code not in self.RETRY_STATUS_CODES:
+                    break
+                retry_after = self._parse_retry_after(e.response)
                 
             except Exception as e:
                 error_msg = f"请求失败 (尝试 {attempt + 1}/{self.retry_times}): {url} - {str(e)}"
                 self.logger.error(error_msg)
                 last_error = NetworkError(error_msg)
             
-            finally:
-                await self.close()
-            
-            # 重试延迟（指数退避 + 随机因子）
+            # 重试延迟：优先使用服务器的 Retry-After，否则为带上限的指数退避，在区间内完全随机
             if attempt < self.retry_times - 1:
-                delay = self.retry_interval * (2 ** attempt) + random.uniform(0.1, 1.0)
+                if retry_after is None:
+                    delay = random.uniform(0, min(self.MAX_RETRY_DELAY, self.retry_interval * (2 ** attempt)))
+                else:
+                    delay = retry_after
                 await asyncio.sleep(delay)
         
         if last_error:
@@ -125,7 +262,8 @@ class Downloader:
         return None
     
     async def __aenter__(self):
-        """异步上下文管理器入口"""
+        """异步上下文管理器入口，创建在整个上下文中复用的会话"""
+        await self.get_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
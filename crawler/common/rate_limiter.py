@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+class TokenBucket:
+    """令牌桶限速器
+
+    等待令牌时在锁外 sleep，多个协程可以同时等待，不会排在单个 sleep 的协程后面。
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """初始化令牌桶
+
+        Args:
+            rate: 每秒生成的令牌数，即允许的请求速率
+            capacity: 桶容量，即允许的突发请求数
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """按流逝的时间补充令牌"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """获取一个令牌，令牌不足时等待"""
+        while True:
+            async with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            # 在锁外等待
+            await asyncio.sleep(wait)
@@ -1,99 +1,198 @@
 import aiofiles
 import os
+import re
+import time
 import asyncio
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 import httpx
 import logging
-from urllib.parse import urljoin
+from urllib.parse import quote, unquote, urljoin, urlparse, urlunparse
 from urllib.robotparser import RobotFileParser
-from datetime import datetime, timedelta
+from datetime import timedelta
 import json
 
 class RobotsParser:
     """Robots.txt 解析器"""
     
+    # 已获取规则的有效期（秒），过期后 init_robots_rules 会重新获取
+    RULES_TTL = 6 * 3600
+    
     def __init__(self, cache_dir: str):
         self.robots_rules: Dict[str, RobotFileParser] = {}
+        # 域名 -> (预编译的匹配函数, 获取时间)
+        self.robots_matchers: Dict[str, Tuple[Callable[[str], bool], float]] = {}
         self.cache_dir = cache_dir
         self.logger = logging.getLogger(__name__)
         self.failed_domains: Set[str] = set()  # 记录获取失败的域名
+        # 域名 -> {"fetched_at": 时间戳, "status": "ok"|"fail", "body": robots.txt 内容}
+        self.cache_entries: Dict[str, dict] = {}
         self.cache_file = os.path.join(cache_dir, "robots_cache.json")
-        self.cache_ttl = timedelta(days=7)  # 缓存有效期7天
+        self.cache_ttl = timedelta(days=7)  # 失败记录缓存有效期7天
         
         # 创建缓存目录
         os.makedirs(cache_dir, exist_ok=True)
         
-        # 加载缓存的失败记录
-        self._load_failed_domains()
+        # 加载缓存的规则和失败记录
+        self._load_cache()
     
-    def _load_failed_domains(self):
-        """加载缓存的失败域名记录"""
+    def _load_cache(self):
+        """加载缓存的robots规则和失败域名记录，未过期的规则无需重新获取"""
         try:
             if os.path.exists(self.cache_file):
                 with open(self.cache_file, 'r') as f:
                     cache_data = json.load(f)
+                now = time.time()
+                for domain, entry in cache_data.items():
+                    # 旧版本缓存只记录失败域名的时间戳
+                    if not isinstance(entry, dict):
+                        entry = {'fetched_at': entry, 'status': 'fail'}
+                    age = now - entry['fetched_at']
                     # 检查缓存是否过期
-                    for domain, timestamp in cache_data.items():
-                        cache_time = datetime.fromtimestamp(timestamp)
-                        if datetime.now() - cache_time < self.cache_ttl:
-                            self.failed_domains.add(domain)
+                    if entry['status'] == 'ok':
+                        if age < self.RULES_TTL:
+                            self._set_rules(domain, entry['body'], entry['fetched_at'])
+                    elif age < self.cache_ttl.total_seconds():
+                        self.failed_domains.add(domain)
+                        self.cache_entries[domain] = entry
                         
         except Exception as e:
             self.logger.warning(f"加载robots缓存失败: {str(e)}")
     
-    def _save_failed_domains(self):
-        """保存失败域名记录到缓存"""
+    async def _save_cache(self):
+        """保存robots规则和失败域名记录到缓存"""
         try:
-            cache_data = {
-                domain: datetime.now().timestamp()
-                for domain in self.failed_domains
-            }
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f)
+            tmp_file = self.cache_file + ".tmp"
+            async with aiofiles.open(tmp_file, 'w') as f:
+                await f.write(json.dumps(self.cache_entries))
+            os.replace(tmp_file, self.cache_file)
                 
         except Exception as e:
             self.logger.warning(f"保存robots缓存失败: {str(e)}")
     
-    async def init_robots_rules(self, domains: List[str], timeout: float = 5.0):
-        """初始化robots规则"""
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            tasks = []
-            for domain in domains:
-                if domain not in self.failed_domains:  # 跳过已知失败的域名
-                    tasks.append(self._fetch_robots(client, domain))
-            
-            if tasks:  # 只在有任务时才等待
-                await asyncio.gather(*tasks, return_exceptions=True)
+    async def init_robots_rules(self, domains: List[str], timeout: float = 5.0,
+                                client: Optional[httpx.AsyncClient] = None,
+                                max_concurrency: int = 8):
+        """初始化robots规则
+        
+        Args:
+            domains: 需要获取规则的域名列表
+            timeout: 单个 robots.txt 请求的超时时间（秒）
+            client: 复用的HTTP客户端，为None时临时创建
+            max_concurrency: 同时获取的最大域名数
+        """
+        now = time.monotonic()
+        pending = [
+            domain for domain in domains
+            # 跳过已知失败的域名，以及规则仍在有效期内的域名
+            if domain not in self.failed_domains and not (
+                domain in self.robots_matchers and
+                now - self.robots_matchers[domain][1] < self.RULES_TTL)
+        ]
         
-        # 保存失败记录
-        self._save_failed_domains()
+        if pending:  # 只在有任务时才发起请求
+            semaphore = asyncio.Semaphore(max_concurrency)
+            
+            async def fetch_one(http_client: httpx.AsyncClient, domain: str):
+                async with semaphore:
+                    # timeout 只限制单次连接或读取，响应缓慢持续时再加一个总时限
+                    try:
+                        await asyncio.wait_for(
+                            self._fetch_robots(http_client, domain, timeout), timeout * 2)
+                    except asyncio.TimeoutError:
+                        self.logger.warning(f"获取 robots.txt 超时 {domain}")
+                        self._mark_failed(domain)
+            
+            if client is not None:
+                await asyncio.gather(*(fetch_one(client, d) for d in pending), return_exceptions=True)
+            else:
+                async with httpx.AsyncClient(timeout=timeout) as own_client:
+                    await asyncio.gather(*(fetch_one(own_client, d) for d in pending), return_exceptions=True)
+            
+            # 保存获取到的规则和失败记录
+            await self._save_cache()
     
-    async def _fetch_robots(self, client: httpx.AsyncClient, domain: str):
+    async def _fetch_robots(self, client: httpx.AsyncClient, domain: str, timeout: float = 5.0):
         """获取单个域名的robots.txt"""
         try:
             robots_url = f"https://{domain}/robots.txt"
-            response = await client.get(robots_url)
+            response = await client.get(robots_url, timeout=timeout)
             
             if response.status_code == 200:
-                parser = RobotFileParser()
-                parser.parse(response.text.splitlines())
-                self.robots_rules[domain] = parser
+                self._set_rules(domain, response.text, time.time())
                 self.logger.info(f"成功获取 robots.txt: {domain}")
             else:
                 self.logger.warning(f"获取 robots.txt 失败 {domain}: HTTP {response.status_code}")
-                self.failed_domains.add(domain)
+                self._mark_failed(domain)
                 
         except Exception as e:
             self.logger.warning(f"获取 robots.txt 出错 {domain}: {str(e)}")
-            self.failed_domains.add(domain)
+            self._mark_failed(domain)
+    
+    def _set_rules(self, domain: str, body: str, fetched_at: float):
+        """解析 robots.txt 内容并记录规则，fetched_at 为获取时的时间戳"""
+        parser = RobotFileParser()
+        parser.parse(body.splitlines())
+        self.robots_rules[domain] = parser
+        # 有效期按单调时钟计算，换算出获取时对应的单调时间
+        fetched_monotonic = time.monotonic() - (time.time() - fetched_at)
+        self.robots_matchers[domain] = (self._build_matcher(parser), fetched_monotonic)
+        self.cache_entries[domain] = {'fetched_at': fetched_at, 'status': 'ok', 'body': body}
+    
+    def _mark_failed(self, domain: str):
+        """记录获取失败的域名"""
+        self.failed_domains.add(domain)
+        self.cache_entries[domain] = {'fetched_at': time.time(), 'status': 'fail'}
+    
+    @staticmethod
+    def _build_matcher(parser: RobotFileParser) -> Callable[[str], bool]:
+        """
+        将 "*" 对应的规则编译为单个正则，返回判断URL是否允许访问的函数
+        
+        规则按出现顺序组成分组交替，re.match 选中的第一个分组即 RobotFileParser
+        "首条匹配规则生效" 的结果，与 can_fetch("*", url) 的语义一致。
+        """
+        if parser.disallow_all:
+            return lambda url: False
+        if parser.allow_all:
+            return lambda url: True
+        
+        # 与 can_fetch 相同的查找顺序：先找适用于 "*" 的普通条目，再用默认条目
+        entry = next((e for e in parser.entries if e.applies_to("*")), parser.default_entry)
+        if entry is None or not entry.rulelines:
+            return lambda url: True
+        
+        allowances = [line.allowance for line in entry.rulelines]
+        if all(allowances):
+            return lambda url: True
+        pattern = re.compile('|'.join(
+            '(.*)' if line.path == '*' else f'({re.escape(line.path)})'
+            for line in entry.rulelines
+        ))
+        
+        def matcher(url: str) -> bool:
+            # 与 can_fetch 相同的路径规范化
+            parsed = urlparse(unquote(url))
+            path = quote(urlunparse(('', '', parsed.path, parsed.params, parsed.query, parsed.fragment))) or "/"
+            match = pattern.match(path)
+            return allowances[match.lastindex - 1] if match else True
+        
+        return matcher
+    
+    def get_crawl_delay(self, domain: str) -> Optional[float]:
+        """获取 robots.txt 中为 "*" 指定的 Crawl-delay（秒），未指定返回 None"""
+        parser = self.robots_rules.get(domain)
+        if not parser:
+            return None
+        delay = parser.crawl_delay("*")
+        return float(delay) if delay else None
     
     def is_url_allowed(self, url: str, domain: str) -> bool:
         """检查URL是否允许访问"""
         if domain in self.failed_domains:  # 对于失败的域名，默认允许访问
             return True
             
-        parser = self.robots_rules.get(domain)
-        if not parser:  # 如果没有规则，也默认允许
+        matcher = self.robots_matchers.get(domain)
+        if not matcher:  # 如果没有规则，也默认允许
             return True
             
-        return parser.can_fetch("*", url)
\ No newline at end of file
+        return matcher[0](url)
\ No newline at end of file
@@ -3,9 +3,19 @@ import os
 from typing import Dict, List, Set
 import logging
 
+try:
+    import orjson  # 可选依赖，缓存文件的读写快数倍
+except ImportError:
+    orjson = None
+
 class URLCacheManager:
     """URL缓存管理器,用于防止重复爬取"""
     
+    # 追加日志累计的条数达到该值时合并到缓存文件
+    COMPACT_THRESHOLD = 1000
+    # 追加日志每累计该条数才写入磁盘一次，而不是每条一次系统调用
+    FLUSH_EVERY = 32
+    
     def __init__(self, cache_file: str):
         """初始化缓存管理器
         
@@ -13,52 +23,106 @@ class URLCacheManager:
             cache_file: 缓存文件路径,如 'data/cache/url_cache.json'
         """
         self.cache_file = cache_file
+        # 新增的URL逐行追加到日志文件，定期合并到缓存文件
+        self.log_file = cache_file + ".log"
         self.cache: Dict[str, Set[str]] = {}
+        self._log_count = 0
+        self._unflushed = 0
         self._load_cache()
+        
+        # 确保缓存目录存在
+        cache_dir = os.path.dirname(self.cache_file)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._log = open(self.log_file, 'a', encoding='utf-8')
     
     def _load_cache(self):
-        """从文件加载缓存"""
+        """从文件加载缓存，再重放追加日志"""
+        self.cache = {}
         if os.path.exists(self.cache_file):
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # 将JSON中的列表转换为集合
-                    self.cache = {
-                        domain: set(urls) for domain, urls in data.items()
-                    }
+                with open(self.cache_file, 'rb') as f:
+                    data = orjson.loads(f.read()) if orjson else json.load(f)
+                # 将JSON中的列表转换为集合
+                self.cache = {domain: set(urls) for domain, urls in data.items()}
                 logging.info(f"已加载URL缓存: {self.cache_file}")
             except Exception as e:
                 logging.error(f"加载缓存文件失败: {str(e)}")
                 self.cache = {}
-        else:
-            self.cache = {}
+        
+        if os.path.exists(self.log_file):
+            try:
+                with open(self.log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # 进程中断时最后一行可能不完整
+                            continue
+                        self.cache.setdefault(entry['d'], set()).add(entry['u'])
+                        self._log_count += 1
+            except Exception as e:
+                logging.error(f"加载缓存日志失败: {str(e)}")
     
     def save_cache(self):
-        """保存缓存到文件"""
+        """保存缓存到文件，成功后清空追加日志"""
         try:
-            # 将集合转换为列表以便JSON序列化
-            data = {
-                domain: list(urls) for domain, urls in self.cache.items()
-            }
-            # 确保缓存目录存在
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            logging.info(f"已保存URL缓存: {self.cache_file}")
+            # 先写临时文件再替换，避免写入中断损坏缓存
+            cache_file = self.cache_file
+            if orjson:
+                # 集合由 default 直接转换为列表，无需构建中间字典
+                with open(cache_file + ".tmp", 'wb') as f:
+                    f.write(orjson.dumps(self.cache, default=list))
+            else:
+                # 将集合转换为列表以便JSON序列化
+                data = {
+                    domain: list(urls) for domain, urls in self.cache.items()
+                }
+                with open(cache_file + ".tmp", 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+            os.replace(cache_file + ".tmp", cache_file)
+            if not self._log.closed:
+                self._log.truncate(0)
+            self._log_count = 0
+            self._unflushed = 0
+            logging.info(f"已保存URL缓存: {cache_file}")
         except Exception as e:
             logging.error(f"保存缓存文件失败: {str(e)}")
     
+    def flush(self):
+        """将缓冲中的追加日志写入磁盘"""
+        if not self._log.closed:
+            self._log.flush()
+            self._unflushed = 0
+    
+    def close(self):
+        """合并追加日志并关闭日志文件"""
+        if not self._log.closed:
+            if self._log_count:
+                self.save_cache()
+            self._log.close()
+    
     def add_url(self, domain: str, url: str):
         """添加URL到缓存
         
+        只向日志追加一行，每 FLUSH_EVERY 条写入一次磁盘，累计 COMPACT_THRESHOLD 条后才重写缓存文件
+        
         Args:
             domain: 网站域名
             url: 要缓存的URL
         """
-        if domain not in self.cache:
-            self.cache[domain] = set()
-        self.cache[domain].add(url)
-        self.save_cache()
+        urls = self.cache.setdefault(domain, set())
+        if url in urls:
+            return
+        urls.add(url)
+        self._log.write(json.dumps({'d': domain, 'u': url}, ensure_ascii=False) + '\n')
+        self._log_count += 1
+        self._unflushed += 1
+        if self._log_count >= self.COMPACT_THRESHOLD:
+            self.save_cache()
+        elif self._unflushed >= self.FLUSH_EVERY:
+            self._log.flush()
+            self._unflushed = 0
     
     def has_url(self, domain: str, url: str) -> bool:
         """检查URL是否已经在缓存中
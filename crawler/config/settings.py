@@ -2,6 +2,9 @@ CONCURRENT_TASKS = 5  # 每个站点的并发任务数
 RETRY_TIMES = 3      # 请求重试次数
 RETRY_INTERVAL = 2   # 重试间隔(秒)
 REQUEST_TIMEOUT = 30 # 请求超时时间(秒)
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024  # 响应体大小上限(字节)
+PER_HOST_DELAY = 0.2  # 同一站点相邻请求的最小间隔(秒)
+GLOBAL_CONCURRENCY = 64  # 所有站点同时进行的请求数上限
 
 CACHE_DIR = "./data/cache/"
 ROBOTS_CACHE_DIR = "./data/cache/robots_cache"
@@ -10,4 +13,7 @@ DOWNLOADER_CONFIG = {
     'retry_times': RETRY_TIMES,
     'retry_interval': RETRY_INTERVAL,
     'timeout': REQUEST_TIMEOUT,
+    'max_bytes': MAX_RESPONSE_BYTES,
+    'per_host_delay': PER_HOST_DELAY,
+    'global_concurrency': GLOBAL_CONCURRENCY,
 }
\ No newline at end of file
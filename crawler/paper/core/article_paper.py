@@ -1,10 +1,54 @@
 from datetime import datetime
 import logging
-from typing import Optional, Dict, List
-from bs4 import BeautifulSoup
+from typing import Callable, Optional, Dict, List
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 from crawler.common.article import Article
 import re
 
+# arxiv 提交历史中第一个版本的提交日期，如 "[v1] Mon, 1 Jan 2024"
+_V1_DATE_RE = re.compile(r'\[v1\]\s+(\w+,\s+\d+\s+\w+\s+\d{4})')
+
+# 英文月份全称和缩写（小写） -> 月份
+_MONTHS = {
+    name: month
+    for month, full in enumerate(
+        ('january', 'february', 'march', 'april', 'may', 'june', 'july',
+         'august', 'september', 'october', 'november', 'december'), 1)
+    for name in (full, full[:3])
+}
+# 日、月份名、年，日和年的写法与 strptime 的 %d、%Y 相同
+_DAY_MONTH_YEAR_RE = re.compile(r'(3[01]|[12]\d|0[1-9]|[1-9])\s+(\S+)\s+(\d{4})')
+
+def _parse_day_month_year(text: str) -> Optional[datetime]:
+    """
+    解析 "7 Dec 2024" / "7 December 2024" 格式的日期，
+    结果与依次尝试 strptime 的 '%d %b %Y'、'%d %B %Y' 一致，无法解析时返回None
+    """
+    match = _DAY_MONTH_YEAR_RE.fullmatch(text.strip())
+    if not match:
+        return None
+    month = _MONTHS.get(match.group(2).lower())
+    if month is None:
+        return None
+    try:
+        return datetime(int(match.group(3)), month, int(match.group(1)))
+    except ValueError:
+        return None
+
+def _find_parent(node: LexborNode, tag: str) -> Optional[LexborNode]:
+    """查找最近的指定标签的祖先节点"""
+    parent = node.parent
+    while parent is not None and parent.tag != tag:
+        parent = parent.parent
+    return parent
+
+def _find_previous_sibling(node: LexborNode, tag: str) -> Optional[LexborNode]:
+    """查找前面最近的指定标签的兄弟节点"""
+    sibling = node.prev
+    while sibling is not None and sibling.tag != tag:
+        sibling = sibling.prev
+    return sibling
+
 class ArticlePaper(Article):
     """论文文章基类"""
     
@@ -26,7 +70,7 @@ class ArticlePaper(Article):
         """
         pass
     
-    def parse_item(self, item: BeautifulSoup) -> Optional['ArticlePaper']:
+    def parse_item(self, item: LexborNode) -> Optional['ArticlePaper']:
         """解析单个论文条目，子类必须实现此方法"""
         raise NotImplementedError
     
@@ -36,23 +80,24 @@ class ArticlePaper(Article):
     
     def to_dict(self) -> Dict:
         """转换为字典格式"""
-        base_dict = super().to_dict() if hasattr(super(), 'to_dict') else {}
-        paper_dict = {
-            'source': self.source,
-            'authors': self.authors,
-            'pdf_url': self.pdf_url,
-            'paper_id': self.paper_id,
-            'comments': self.comments,
-            'subjects': self.subjects
-        }
-        return {**base_dict, **paper_dict}
+        # 直接在基类结果上更新，省去中间字典和合并时的复制
+        paper_dict = super().to_dict() if hasattr(super(), 'to_dict') else {}
+        paper_dict.update(
+            source=self.source,
+            authors=self.authors,
+            pdf_url=self.pdf_url,
+            paper_id=self.paper_id,
+            comments=self.comments,
+            subjects=self.subjects
+        )
+        return paper_dict
     
     def to_text(self) -> str:
         """转换为文本格式"""
         text_parts = [
             f"标题：{self.title}",
             f"作者：{', '.join(self.authors) if self.authors else '未知'}",
-            f"发布日期：{self.publish_date.strftime('%Y-%m-%d') if self.publish_date else '未知'}"
+            f"发布日期：{self.publish_date.isoformat()[:10] if self.publish_date else '未知'}"
         ]
         
         if self.pdf_url:
@@ -74,34 +119,39 @@ class ArxivPaper(ArticlePaper):
         self.source = 'arxiv'
         self.downloader = None  # 将在parse_item时设置
     
-    async def parse_item(self, item: BeautifulSoup, downloader) -> Optional['ArxivPaper']:
-        """解析arxiv论文条目"""
+    async def parse_item(self, item: LexborNode, downloader,
+                         skip_url: Optional[Callable[[str], bool]] = None) -> Optional['ArxivPaper']:
+        """解析arxiv论文条目，skip_url 对论文URL返回 True 时不获取详情，直接返回 None"""
         try:
             self.downloader = downloader
             # 提取标题
-            if title_div := item.find('div', class_='list-title'):
-                self.title = title_div.text.replace('Title:', '').strip()
+            if title_div := item.css_first('div.list-title'):
+                self.title = title_div.text().replace('Title:', '').strip()
             
             # 提取作者
-            if authors_div := item.find('div', class_='list-authors'):
-                self.authors = [a.text.strip() for a in authors_div.find_all('a')]
+            if authors_div := item.css_first('div.list-authors'):
+                self.authors = [a.text().strip() for a in authors_div.css('a')]
             
             # 提取链接
-            if dt := item.find_previous_sibling('dt'):
-                if abs_link := dt.find('a', href=True, title='Abstract'):
-                    self.url = f"https://arxiv.org{abs_link['href']}"
-                    self.paper_id = abs_link['id']
+            if dt := _find_previous_sibling(item, 'dt'):
+                if abs_link := dt.css_first('a[href][title="Abstract"]'):
+                    self.url = f"https://arxiv.org{abs_link.attributes['href']}"
+                    self.paper_id = abs_link.attributes['id']
                 
-                if pdf_link := dt.find('a', title='Download PDF'):
-                    self.pdf_url = f"https://arxiv.org{pdf_link['href']}"
+                if pdf_link := dt.css_first('a[title="Download PDF"]'):
+                    self.pdf_url = f"https://arxiv.org{pdf_link.attributes['href']}"
+            
+            # 已保存过的论文不再获取详情页
+            if self.url and skip_url and skip_url(self.url):
+                return None
             
             # 提取评论信息
-            if comments_div := item.find('div', class_='list-comments'):
-                self.comments = comments_div.text.replace('Comments:', '').strip()
+            if comments_div := item.css_first('div.list-comments'):
+                self.comments = comments_div.text().replace('Comments:', '').strip()
             
             # 提取主题领域
-            if subjects_div := item.find('div', class_='list-subjects'):
-                self.subjects = subjects_div.text.replace('Subjects:', '').strip()
+            if subjects_div := item.css_first('div.list-subjects'):
+                self.subjects = subjects_div.text().replace('Subjects:', '').strip()
             
             # 获取详细信息
             if self.url:
@@ -125,17 +175,18 @@ class ArxivPaper(ArticlePaper):
                 logging.error(f"获取论文详情失败: {self.url}")
                 return
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # 详情页只取两个节点，使用比 BeautifulSoup 快一个数量级的 selectolax 解析
+            html = LexborHTMLParser(response.text)
             
             # 提取摘要
-            if abstract_div := soup.find('blockquote', class_='abstract'):
-                self.summary = abstract_div.text.replace('Abstract:', '').strip()
+            if abstract_div := html.css_first('blockquote.abstract'):
+                self.summary = abstract_div.text().replace('Abstract:', '').strip()
             
             # 提取发布日期
-            if date_span := soup.find('div', class_='submission-history'):
-                date_text = date_span.text
+            if date_span := html.css_first('div.submission-history'):
+                date_text = date_span.text()
                 # 提取第一次提交的日期
-                if match := re.search(r'\[v1\]\s+(\w+,\s+\d+\s+\w+\s+\d{4})', date_text):
+                if match := _V1_DATE_RE.search(date_text):
                     date_str = match.group(1)
                     try:
                         self.publish_date = datetime.strptime(date_str, '%a, %d %b %Y')
@@ -143,7 +194,7 @@ class ArxivPaper(ArticlePaper):
                         logging.error(f"日期解析失败: {date_str}")
             
             # 提取其他可能的元数据
-            if meta_div := soup.find('div', class_='metatable'):
+            if meta_div := html.css_first('div.metatable'):
                 # 处理DOI等信息
                 pass
                 
@@ -157,28 +208,51 @@ class HuggingFacePaper(ArticlePaper):
         super().__init__(url, html, config)
         self.source = 'huggingface'
     
-    def parse_item(self, item: BeautifulSoup) -> Optional['HuggingFacePaper']:
-        """解析 HuggingFace 论文条目"""
+    def parse_item(self, item: LexborNode) -> Optional['HuggingFacePaper']:
+        """解析 HuggingFace 论文条目（selectolax 节点）"""
         try:
             # 提取标题和URL
-            if title_elem := item.select_one('h3 a.line-clamp-3'):
-                self.title = title_elem.text.strip()
-                if url := title_elem.get('href'):
+            if title_elem := item.css_first('h3 a.line-clamp-3'):
+                self.title = title_elem.text().strip()
+                if url := title_elem.attributes.get('href'):
                     self.url = f"https://huggingface.co{url}" if not url.startswith('http') else url
             
-            # 提取摘要
-            for selector in ['p.text-gray-700', 'div.pb-8.pr-4.md\\:pr-16 p', 'div.pb-8 p']:
-                if abstract_elem := item.select_one(selector):
-                    self.summary = abstract_elem.text.strip()
+            # 提取摘要（selectolax 不支持类名中的转义冒号，md:pr-16 用属性选择器匹配）
+            for selector in ['p.text-gray-700', 'div.pb-8.pr-4[class~="md:pr-16"] p', 'div.pb-8 p']:
+                if abstract_elem := item.css_first(selector):
+                    self.summary = abstract_elem.text().strip()
                     break
             
             # 提取作者
-            if author_elem := item.select_one('div.author-info'):
-                self.authors = [a.text.strip() for a in author_elem.select('a')]
+            if author_elem := item.css_first('div.author-info'):
+                self.authors = [a.text().strip() for a in author_elem.css('a')]
             
             # 提取PDF链接
-            if pdf_elem := item.select_one('a[href$=".pdf"]'):
-                self.pdf_url = pdf_elem['href']
+            if pdf_elem := item.css_first('a[href$=".pdf"]'):
+                self.pdf_url = pdf_elem.attributes['href']
+            
+            return self if self._is_valid() else None
+            
+        except Exception as e:
+            logging.error(f"解析HuggingFace论文失败: {str(e)}", exc_info=True)
+            return None
+    
+    def parse_api_item(self, item: Dict) -> Optional['HuggingFacePaper']:
+        """解析 HuggingFace daily_papers 接口返回的论文条目，无需解析HTML"""
+        try:
+            paper = item.get('paper') or item
+            self.title = (paper.get('title') or '').strip()
+            if paper_id := paper.get('id'):
+                self.url = f"https://huggingface.co/papers/{paper_id}"
+            self.summary = (paper.get('summary') or '').strip()
+            self.authors = [
+                author['name'] for author in paper.get('authors') or () if author.get('name')
+            ]
+            if published_at := paper.get('publishedAt'):
+                try:
+                    self.publish_date = datetime.fromisoformat(published_at)
+                except ValueError:
+                    pass
             
             return self if self._is_valid() else None
             
@@ -193,37 +267,32 @@ class PaperWithCodePaper(ArticlePaper):
         super().__init__(url, html, config)
         self.source = 'paperswithcode'
     
-    def parse_item(self, item: BeautifulSoup) -> Optional['PaperWithCodePaper']:
-        """解析 PapersWithCode 论文条目"""
+    def parse_item(self, item: LexborNode) -> Optional['PaperWithCodePaper']:
+        """解析 PapersWithCode 论文条目（selectolax 节点）"""
         try:
             # 提取标题和URL
-            if title_elem := item.select_one('h1, div.paper-title'):
-                self.title = title_elem.text.strip()
-                if url_elem := title_elem.find_parent('a'):
-                    url = url_elem['href']
+            if title_elem := item.css_first('h1, div.paper-title'):
+                self.title = title_elem.text().strip()
+                if url_elem := _find_parent(title_elem, 'a'):
+                    url = url_elem.attributes['href']
                     self.url = f"https://paperswithcode.com{url}" if not url.startswith('http') else url
             
             # 提取日期
-            if date_elem := item.select_one('span.author-span'):
-                date_text = date_elem.text.strip()
-                for fmt in ['%d %b %Y', '%d %B %Y']:
-                    try:
-                        self.publish_date = datetime.strptime(date_text, fmt)
-                        break
-                    except ValueError:
-                        continue
+            if date_elem := item.css_first('span.author-span'):
+                if publish_date := _parse_day_month_year(date_elem.text()):
+                    self.publish_date = publish_date
             
             # 提取作者
-            if authors_elem := item.select('div.author-name'):
-                self.authors = [author.text.strip() for author in authors_elem]
+            if authors_elem := item.css('div.author-name'):
+                self.authors = [author.text().strip() for author in authors_elem]
             
             # 提取摘要
-            if abstract_elem := item.select_one('div.paper-abstract'):
-                self.summary = abstract_elem.text.strip()
+            if abstract_elem := item.css_first('div.paper-abstract'):
+                self.summary = abstract_elem.text().strip()
             
             # 提取PDF链接
-            if pdf_elem := item.select_one('a[href*="arxiv.org/pdf"]'):
-                self.pdf_url = pdf_elem['href']
+            if pdf_elem := item.css_first('a[href*="arxiv.org/pdf"]'):
+                self.pdf_url = pdf_elem.attributes['href']
             
             return self if self._is_valid() else None
             
@@ -41,8 +41,8 @@ async def main():
     logger.info(f"已启用的站点: {', '.join(enabled_sites)}")
     
     # 创建爬虫并开始爬取
-    crawler = PaperCrawler(config)
-    await crawler.crawl()
+    async with PaperCrawler(config) as crawler:
+        await crawler.crawl()
     
     # 输出结果统计
     logger.info(f"爬取完成，共获取 {len(crawler.papers)} 篇论文")
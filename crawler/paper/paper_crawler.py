@@ -1,18 +1,30 @@
 import os
+import re
+import asyncio
 import logging
 import platform
-from typing import Optional, Dict, List
-from bs4 import BeautifulSoup
+from contextlib import aclosing
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from typing import AsyncIterator, Optional, Dict, List, Set
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 from crawler.common.downloader import Downloader
 from crawler.paper.config.settings import STORAGE_CONFIG, CRAWL_LIMITS
 from crawler.config.settings import DOWNLOADER_CONFIG
 from crawler.common.url_cache_manager import URLCacheManager
-from datetime import datetime
+from datetime import date
 from crawler.paper.core.article_paper import (
     ArticlePaper, ArxivPaper, HuggingFacePaper, PaperWithCodePaper
 )
 import json
 
+try:
+    import orjson  # 可选依赖，解析接口返回的JSON快数倍
+except ImportError:
+    orjson = None
+
+# 文件名中需要去掉的字符：除字母数字（含中文等）和 "._- " 以外的字符，与 str.isalnum 判断一致
+_FILENAME_DROP_RE = re.compile(r'[^\w. -]')
+
 class PaperCrawlerConfig:
     """论文爬虫配置类"""
     def __init__(self):
@@ -28,6 +40,8 @@ class PaperCrawlerConfig:
             },
             'huggingface': {
                 'start_url': 'https://huggingface.co/papers',
+                # 每日论文接口，直接返回JSON，获取失败时回退到解析列表页
+                'api_url': 'https://huggingface.co/api/daily_papers',
                 'max_pages': 10,
                 'page_size': 20
             },
@@ -45,6 +59,10 @@ class PageCount:
         
     def add(self):
         self.count += 1
+        
+    def release(self):
+        """归还 add 预占的名额"""
+        self.count -= 1
 
     def need_more(self) -> bool:
         return self.count < CRAWL_LIMITS['max_pages_per_source']
@@ -55,13 +73,29 @@ class PageCount:
 class PaperCrawler:
     """论文爬虫基类"""
     
+    # 同时获取的论文详情页数
+    DETAIL_CONCURRENCY = 8
+    # 同时获取的列表页数
+    PAGE_CONCURRENCY = 4
+    # 保存队列的最大长度，写入跟不上时抓取等待
+    SAVE_QUEUE_SIZE = 256
+    
     def __init__(self, config: Optional[PaperCrawlerConfig] = None):
         self.config = config or PaperCrawlerConfig()
         self.papers: List[ArticlePaper] = []
         self.crawlers = self._init_crawlers()
         self.downloader = Downloader(**DOWNLOADER_CONFIG)
-        self.page_count = PageCount()
+        # 每个渠道独立计数，并发抓取时各自的页数限制互不影响
+        self.page_counts: Dict[str, PageCount] = {
+            source: PageCount() for source in self.config.source_configs
+        }
         self.url_cache = URLCacheManager('data/cache/url_cache.json')
+        # 已创建的保存目录，避免每篇论文都调用 makedirs
+        self._created_dirs: Set[str] = set()
+        # 本次爬取的日期 (YYYY-MM-DD)，在 crawl 开始时确定，同一次爬取的论文保存到同一日期目录
+        self._date_str: Optional[str] = None
+        # 待保存论文的队列，crawl 期间由单独的协程写入磁盘，抓取不必等待写入
+        self._save_queue: Optional[asyncio.Queue] = None
         
         # 确保存储目录存在
         os.makedirs(STORAGE_CONFIG['base_dir'], exist_ok=True)
@@ -83,6 +117,9 @@ class PaperCrawler:
     
     async def crawl(self):
         """开始爬取所有启用的渠道"""
+        self._date_str = date.today().isoformat()
+        self._save_queue = asyncio.Queue(maxsize=self.SAVE_QUEUE_SIZE)
+        saver = asyncio.create_task(self._save_loop())
         try:
             crawl_methods = {
                 'arxiv': self.crawl_arxiv,
@@ -90,110 +127,248 @@ class PaperCrawler:
                 'paperswithcode': self.crawl_paperswithcode
             }
             
-            for source, enabled in self.config.enabled_sources.items():
-                if enabled and source in crawl_methods:
-                    try:
-                        await crawl_methods[source]()
-                    except Exception as e:
-                        logging.error(f"爬取 {source} 失败: {str(e)}", exc_info=True)
+            async def crawl_source(source: str):
+                try:
+                    await crawl_methods[source]()
+                except Exception as e:
+                    logging.error(f"爬取 {source} 失败: {str(e)}", exc_info=True)
+            
+            # 各渠道是不同的站点，并发抓取，互不等待
+            await asyncio.gather(*(
+                crawl_source(source)
+                for source, enabled in self.config.enabled_sources.items()
+                if enabled and source in crawl_methods
+            ))
+            # 等待队列中的论文全部保存
+            await self._save_queue.join()
                         
         except Exception as e:
             logging.error(f"爬取过程出错: {str(e)}", exc_info=True)
         finally:
-            await self.downloader.close()
-            logging.info(f"共爬取 {self.page_count.get()} 个页面")
+            saver.cancel()
+            self._save_queue = None
+            # 下载器和缓存在多次爬取间复用，由 close 统一关闭
+            self.url_cache.flush()
+            logging.info(f"共爬取 {sum(count.get() for count in self.page_counts.values())} 个页面")
+    
+    async def close(self):
+        """关闭下载器会话并合并URL缓存，不再爬取时调用"""
+        await self.downloader.close()
+        self.url_cache.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
             
-    async def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
-        """获取页面内容并解析"""
+    async def _fetch_page(self, url: str) -> Optional[LexborHTMLParser]:
+        """获取页面内容并用 selectolax 的 lexbor 解析器解析，列表页只需按选择器取节点"""
         try:
             response = await self.downloader.get(url)
-            if response and hasattr(response, 'text'):
-                return BeautifulSoup(response.text, 'html.parser')
+            if response is not None:
+                return LexborHTMLParser(response.text)
         except Exception as e:
             logging.error(f"获取页面失败 {url}: {str(e)}")
         return None
     
+    async def _iter_pages(self, urls: List[str]) -> AsyncIterator[Optional[LexborHTMLParser]]:
+        """并发获取多个列表页，按顺序逐个返回解析结果
+        
+        最多同时获取 PAGE_CONCURRENCY 个页面；调用方提前结束迭代时取消未完成的获取，
+        需配合 contextlib.aclosing 使用以便及时取消
+        """
+        semaphore = asyncio.Semaphore(self.PAGE_CONCURRENCY)
+        
+        async def fetch(url: str) -> Optional[LexborHTMLParser]:
+            async with semaphore:
+                return await self._fetch_page(url)
+        
+        tasks = [asyncio.create_task(fetch(url)) for url in urls]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _fetch_json(self, url: str):
+        """获取接口返回的JSON数据"""
+        try:
+            response = await self.downloader.get(url)
+            if response is not None:
+                return orjson.loads(response.content) if orjson else json.loads(response.content)
+        except Exception as e:
+            logging.error(f"获取接口数据失败 {url}: {str(e)}")
+        return None
+    
     def _get_save_path(self, paper: ArticlePaper) -> str:
         """获取文章保存路径"""
         # 使用日期和来源创建子目录
-        date_str = datetime.now().strftime('%Y-%m-%d')
+        date_str = self._date_str or date.today().isoformat()
         source_dir = os.path.join(STORAGE_CONFIG['base_dir'], paper.source, date_str)
-        os.makedirs(source_dir, exist_ok=True)
+        if source_dir not in self._created_dirs:
+            os.makedirs(source_dir, exist_ok=True)
+            self._created_dirs.add(source_dir)
         
         # 使用论文ID或标题作为文件名
         filename = f"{paper.paper_id or paper.title[:50]}.txt"
         # 替换文件名中的非法字符
-        filename = "".join(c for c in filename if c.isalnum() or c in "._- ")
+        filename = _FILENAME_DROP_RE.sub('', filename)
         
         return os.path.join(source_dir, filename)
     
-    def save_paper(self, paper: ArticlePaper):
+    async def save_paper(self, paper: ArticlePaper):
         """保存论文信息"""
         try:
-            save_path = self._get_save_path(paper)
-            with open(save_path, 'w', encoding='utf-8') as f:
-                f.write(paper.to_text())
+            # 磁盘读写放到线程中执行，避免阻塞事件循环
+            save_path = await asyncio.to_thread(self._write_paper, paper, paper.to_text())
+            # 记录已保存的论文，之后的运行不再重复获取
+            self.url_cache.add_url(paper.source, paper.url)
             logging.info(f"保存论文成功: {save_path}")
         except Exception as e:
             logging.error(f"保存论文失败: {str(e)}", exc_info=True)
+    
+    async def _queue_save(self, paper: ArticlePaper):
+        """将论文放入保存队列，不在 crawl 中调用时直接保存"""
+        if self._save_queue is None:
+            await self.save_paper(paper)
+        else:
+            await self._save_queue.put(paper)
+    
+    async def _save_loop(self):
+        """逐个取出保存队列中的论文写入磁盘"""
+        while True:
+            paper = await self._save_queue.get()
+            try:
+                await self.save_paper(paper)
+            finally:
+                self._save_queue.task_done()
+    
+    def _is_saved(self, paper: ArticlePaper) -> bool:
+        """论文是否已在之前的运行中保存过"""
+        return self.url_cache.has_url(paper.source, paper.url)
+    
+    def _write_paper(self, paper: ArticlePaper, text: str) -> str:
+        """同步写入论文文件，在工作线程中执行，返回保存路径"""
+        save_path = self._get_save_path(paper)
+        with open(save_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return save_path
 
     async def crawl_arxiv(self):
         """抓取 arxiv 论文"""
         source_config = self.config.source_configs['arxiv']
+        page_count = self.page_counts['arxiv']
         base_url = source_config['start_url']
+        max_pages = source_config['max_pages']
         
-        for page in range(source_config['max_pages']):
+        # 起始URL只解析一次，各页只设置 skip 参数，起始URL中没有 skip 时也能翻页
+        parts = urlsplit(base_url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'skip']
+        
+        def fetch_list_page(page: int) -> asyncio.Task:
             skip = page * source_config['page_size']
-            url = base_url.replace('skip=0', f'skip={skip}')
-            
-            if soup := await self._fetch_page(url):
-                items = soup.find_all('dd')
-                for item in items:
-                    if paper := await self.crawlers['arxiv'].parse_item(item, self.downloader):
-                        self.papers.append(paper)
-                        self.save_paper(paper)
-                        self.page_count.add()
+            url = urlunsplit(parts._replace(query=urlencode([*query, ('skip', skip)])))
+            return asyncio.create_task(self._fetch_page(url))
+        
+        # 每个条目都要获取详情页，限制并发数同时获取
+        semaphore = asyncio.Semaphore(self.DETAIL_CONCURRENCY)
+        
+        def is_saved(url: str) -> bool:
+            return self.url_cache.has_url('arxiv', url)
+        
+        async def parse_one(item: LexborNode):
+            async with semaphore:
+                if not page_count.need_more():
+                    return
+                # 获取详情前先预占名额，避免并发获取的条目超出限制；未得到论文时归还
+                page_count.add()
+                try:
+                    # 每个条目使用独立的实例，并发解析时互不影响
+                    paper = await ArxivPaper().parse_item(item, self.downloader, skip_url=is_saved)
+                except BaseException:
+                    page_count.release()
+                    raise
+                if not paper:
+                    page_count.release()
+                    return
+                self.papers.append(paper)
+                await self._queue_save(paper)
+        
+        next_page = fetch_list_page(0) if max_pages > 0 else None
+        try:
+            for page in range(max_pages):
+                tree = await next_page
+                # 获取本页详情的同时预取下一页列表
+                next_page = fetch_list_page(page + 1) if page + 1 < max_pages else None
+                
+                if tree:
+                    # 只取论文列表中的条目，页面结构变化找不到列表时退回到全部 dd
+                    items = tree.css('dl#articles > dd') or tree.css('dd')
+                    await asyncio.gather(*(parse_one(item) for item in items))
                         
-                if not self.page_count.need_more():
-                    break
+                    if not page_count.need_more():
+                        break
+        finally:
+            if next_page is not None:
+                next_page.cancel()
 
     async def crawl_huggingface(self):
         """抓取 HuggingFace 论文"""
         source_config = self.config.source_configs['huggingface']
+        page_count = self.page_counts['huggingface']
         base_url = source_config['start_url']
         
-        for page in range(source_config['max_pages']):
-            url = f"{base_url}?page={page+1}"
-            
-            if soup := await self._fetch_page(url):
-                items = soup.select('div.paper-card')
+        # 优先使用JSON接口，无需解析HTML
+        if api_url := source_config.get('api_url'):
+            items = await self._fetch_json(api_url)
+            if isinstance(items, list) and items:
                 for item in items:
-                    if paper := self.crawlers['huggingface'].parse_item(item):
+                    if not page_count.need_more():
+                        break
+                    paper = HuggingFacePaper().parse_api_item(item) if isinstance(item, dict) else None
+                    if paper and not self._is_saved(paper):
                         self.papers.append(paper)
-                        self.save_paper(paper)
-                        self.page_count.add()
-                        
-                if not self.page_count.need_more():
-                    break
+                        await self._queue_save(paper)
+                        page_count.add()
+                return
+        
+        urls = [f"{base_url}?page={page+1}" for page in range(source_config['max_pages'])]
+        async with aclosing(self._iter_pages(urls)) as pages:
+            async for tree in pages:
+                if tree:
+                    items = tree.css('div.paper-card')
+                    for item in items:
+                        paper = HuggingFacePaper().parse_item(item)
+                        if paper and not self._is_saved(paper):
+                            self.papers.append(paper)
+                            await self._queue_save(paper)
+                            page_count.add()
+                            
+                    if not page_count.need_more():
+                        break
 
     async def crawl_paperswithcode(self):
         """抓取 PapersWithCode 论文"""
         source_config = self.config.source_configs['paperswithcode']
+        page_count = self.page_counts['paperswithcode']
         base_url = source_config['start_url']
         
-        for page in range(source_config['max_pages']):
-            url = f"{base_url}?page={page+1}"
-            
-            if soup := await self._fetch_page(url):
-                items = soup.select('div.paper-item')
-                for item in items:
-                    if paper := self.crawlers['paperswithcode'].parse_item(item):
-                        self.papers.append(paper)
-                        self.save_paper(paper)
-                        self.page_count.add()
-                        
-                if not self.page_count.need_more():
-                    break
+        urls = [f"{base_url}?page={page+1}" for page in range(source_config['max_pages'])]
+        async with aclosing(self._iter_pages(urls)) as pages:
+            async for tree in pages:
+                if tree:
+                    items = tree.css('div.paper-item')
+                    for item in items:
+                        paper = PaperWithCodePaper().parse_item(item)
+                        if paper and not self._is_saved(paper):
+                            self.papers.append(paper)
+                            await self._queue_save(paper)
+                            page_count.add()
+                            
+                    if not page_count.need_more():
+                        break
 
 class StopCrawling(Exception):
     """达到爬取限制时抛出的异常"""
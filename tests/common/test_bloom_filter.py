@@ -0,0 +1,34 @@
+import unittest
+from crawler.common.bloom_filter import BloomFilter
+
+class TestBloomFilter(unittest.TestCase):
+    def test_add_and_contains(self):
+        """测试添加和查询"""
+        bloom = BloomFilter(capacity=100, error_rate=1e-4)
+        self.assertTrue(bloom.add('https://example.com/a'))
+        self.assertIn('https://example.com/a', bloom)
+        self.assertNotIn('https://example.com/b', bloom)
+        self.assertEqual(len(bloom), 1)
+    
+    def test_duplicate_add(self):
+        """测试重复添加"""
+        bloom = BloomFilter(capacity=100, error_rate=1e-4)
+        bloom.add('https://example.com/a')
+        self.assertFalse(bloom.add('https://example.com/a'))
+        self.assertEqual(len(bloom), 1)
+    
+    def test_grows_beyond_capacity(self):
+        """测试超出容量后自动扩容且不漏判"""
+        bloom = BloomFilter(capacity=50, error_rate=1e-3)
+        urls = [f'https://example.com/{i}' for i in range(500)]
+        for url in urls:
+            bloom.add(url)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertIn(url, bloom)
+        
+        false_positives = sum(f'https://other.com/{i}' in bloom for i in range(2000))
+        self.assertLess(false_positives, 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+from crawler.common.cache_manager import CacheManager
+
+class TestCacheManager(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        # 降低合并阈值，少量URL即可触发后台合并
+        patcher = mock.patch.object(CacheManager, 'COMPACT_THRESHOLD', 5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def _urls(self, count, start=0):
+        return [f'https://example.com/{i}' for i in range(start, start + count)]
+    
+    def _abandon(self, manager):
+        """模拟进程中断：不合并，只关闭日志文件句柄"""
+        if manager._saver is not None:
+            manager._saver.join()
+        manager._log.close()
+    
+    def test_replay_log_after_restart(self):
+        """测试未关闭时重启后从追加日志恢复"""
+        manager = CacheManager(self.cache_dir)
+        urls = self._urls(3)
+        for url in urls:
+            manager.add_to_cache(url, 'example.com')
+        self._abandon(manager)
+        self.assertFalse(os.path.exists(manager.cache_file))
+        
+        manager = CacheManager(self.cache_dir)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(manager.is_cached(url, 'example.com'))
+        self.assertFalse(manager.is_cached('https://example.com/other', 'example.com'))
+        self.assertEqual(manager.get_cache_size(), 3)
+        manager.close()
+    
+    def test_truncated_last_line_is_skipped(self):
+        """测试日志最后一行不完整时跳过该行"""
+        manager = CacheManager(self.cache_dir)
+        manager.add_to_cache('https://example.com/a', 'example.com')
+        self._abandon(manager)
+        with open(manager.log_file, 'a', encoding='utf-8') as f:
+            f.write('{"d": "example.com", "h": 12')
+        
+        manager = CacheManager(self.cache_dir)
+        self.assertTrue(manager.is_cached('https://example.com/a', 'example.com'))
+        self.assertEqual(manager.get_cache_size(), 1)
+        manager.close()
+    
+    def test_compact_at_threshold(self):
+        """测试日志达到阈值时在后台合并到主缓存文件"""
+        manager = CacheManager(self.cache_dir)
+        urls = self._urls(CacheManager.COMPACT_THRESHOLD + 2)
+        for url in urls:
+            manager.add_to_cache(url, 'example.com')
+        self.assertIsNotNone(manager._saver)
+        manager._saver.join()
+        
+        with open(manager.cache_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['example.com']), CacheManager.COMPACT_THRESHOLD)
+        self.assertFalse(os.path.exists(manager.pending_log_file))
+        # 合并之后新增的URL只在新的日志中
+        self.assertEqual(manager._log_count, 2)
+        self._abandon(manager)
+        
+        manager = CacheManager(self.cache_dir)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(manager.is_cached(url, 'example.com'))
+        manager.close()
+    
+    def test_recover_pending_log(self):
+        """测试启动时合并上次运行遗留的待合并日志"""
+        manager = CacheManager(self.cache_dir)
+        manager.add_to_cache('https://example.com/a', 'example.com')
+        self._abandon(manager)
+        # 模拟后台合并在写入主缓存文件前中断
+        os.replace(manager.log_file, manager.pending_log_file)
+        
+        manager = CacheManager(self.cache_dir)
+        self.assertTrue(manager.is_cached('https://example.com/a', 'example.com'))
+        self.assertFalse(os.path.exists(manager.pending_log_file))
+        with open(manager.cache_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['example.com']), 1)
+        manager.close()
+    
+    def test_close_waits_for_saver(self):
+        """测试关闭时等待后台合并线程完成"""
+        manager = CacheManager(self.cache_dir)
+        save_cache = manager._save_cache
+        
+        def slow_save_cache(cache_data=None):
+            time.sleep(0.2)
+            return save_cache(cache_data)
+        
+        manager._save_cache = slow_save_cache
+        urls = self._urls(CacheManager.COMPACT_THRESHOLD + 1)
+        for url in urls:
+            manager.add_to_cache(url, 'example.com')
+        saver = manager._saver
+        self.assertTrue(saver.is_alive())
+        
+        manager.close()
+        self.assertFalse(saver.is_alive())
+        self.assertTrue(manager._log.closed)
+        self.assertFalse(os.path.exists(manager.pending_log_file))
+        self.assertEqual(os.path.getsize(manager.log_file), 0)
+        with open(manager.cache_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['example.com']), len(urls))
+    
+    def test_migrate_legacy_cache(self):
+        """测试从旧版本的完整URL缓存迁移，且无新增URL时也会保存"""
+        urls = self._urls(3)
+        legacy_file = os.path.join(self.cache_dir, 'url_cache.json')
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump({'example.com': urls}, f)
+        
+        manager = CacheManager(self.cache_dir)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(manager.is_cached(url, 'example.com'))
+        manager.close()
+        self.assertTrue(os.path.exists(manager.cache_file))
+        
+        # 迁移完成后不再读取旧文件
+        os.remove(legacy_file)
+        manager = CacheManager(self.cache_dir)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(manager.is_cached(url, 'example.com'))
+        manager.close()
+
+if __name__ == '__main__':
+    unittest.main()
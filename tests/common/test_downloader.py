@@ -0,0 +1,197 @@
+import asyncio
+import gzip
+import time
+import unittest
+from unittest import mock
+import httpx
+from crawler.common.downloader import Downloader, NetworkError, ResponseTooLargeError
+
+class DownloaderTestCase(unittest.IsolatedAsyncioTestCase):
+    """使用 httpx.MockTransport 代替网络请求，记录每次请求"""
+    
+    def make_downloader(self, handler, **kwargs):
+        self.requests = []
+        
+        async def recording_handler(request):
+            self.requests.append(request)
+            return await handler(request)
+        
+        kwargs.setdefault('retry_interval', 0)
+        downloader = Downloader(**kwargs)
+        downloader.session = httpx.AsyncClient(
+            transport=httpx.MockTransport(recording_handler), follow_redirects=True)
+        self.addAsyncCleanup(downloader.close)
+        return downloader
+
+class TestResponseBody(DownloaderTestCase):
+    async def test_content_length_over_limit(self):
+        """测试 Content-Length 超过上限时不重试，直接抛出异常"""
+        async def handler(request):
+            return httpx.Response(200, headers={'Content-Length': '2048'}, content=b'x' * 2048)
+        
+        downloader = self.make_downloader(handler, max_bytes=1024)
+        with self.assertRaises(ResponseTooLargeError):
+            await downloader.get('https://example.com/big')
+        self.assertEqual(len(self.requests), 1)
+    
+    async def test_streamed_body_over_limit(self):
+        """测试没有 Content-Length 的流式响应超过上限时停止读取"""
+        async def body():
+            for _ in range(64):
+                yield b'x' * 1024
+        
+        async def handler(request):
+            return httpx.Response(200, content=body())
+        
+        downloader = self.make_downloader(handler, max_bytes=4096)
+        with self.assertRaises(ResponseTooLargeError):
+            await downloader.get('https://example.com/stream')
+        self.assertEqual(len(self.requests), 1)
+    
+    async def test_gzip_body_is_decoded(self):
+        """测试 gzip 响应体被解压，并去掉不再适用的 Content-Encoding 和 Content-Length"""
+        text = '<html>正文</html>' * 100
+        compressed = gzip.compress(text.encode('utf-8'))
+        
+        async def handler(request):
+            return httpx.Response(200, headers={
+                'Content-Encoding': 'gzip',
+                'Content-Length': str(len(compressed)),
+                'Content-Type': 'text/html; charset=utf-8',
+            }, content=compressed)
+        
+        downloader = self.make_downloader(handler)
+        response = await downloader.get('https://example.com/gzip')
+        self.assertEqual(response.text, text)
+        self.assertEqual(response.content, text.encode('utf-8'))
+        self.assertNotIn('Content-Encoding', response.headers)
+        # 原响应中压缩后的长度被去掉，httpx 按解压后的响应体重新计算
+        self.assertEqual(response.headers['Content-Length'], str(len(response.content)))
+        self.assertEqual(response.headers['Content-Type'], 'text/html; charset=utf-8')
+        self.assertEqual(str(response.url), 'https://example.com/gzip')
+
+class TestRetry(DownloaderTestCase):
+    async def test_client_error_not_retried(self):
+        """测试404等不可重试的状态码只请求一次"""
+        async def handler(request):
+            return httpx.Response(404)
+        
+        downloader = self.make_downloader(handler, retry_times=3)
+        with self.assertRaises(NetworkError):
+            await downloader.get('https://example.com/missing')
+        self.assertEqual(len(self.requests), 1)
+    
+    async def test_retryable_status_uses_all_attempts(self):
+        """测试503、429、408等可重试的状态码用完全部重试次数"""
+        for status_code in (503, 429, 408):
+            with self.subTest(status_code=status_code):
+                async def handler(request):
+                    return httpx.Response(status_code)
+                
+                downloader = self.make_downloader(handler, retry_times=3)
+                with self.assertRaises(NetworkError):
+                    await downloader.get('https://example.com/busy')
+                self.assertEqual(len(self.requests), 3)
+    
+    async def test_success_after_retry(self):
+        """测试重试后成功时返回响应"""
+        async def handler(request):
+            if len(self.requests) < 3:
+                return httpx.Response(502)
+            return httpx.Response(200, content=b'ok')
+        
+        downloader = self.make_downloader(handler, retry_times=3)
+        response = await downloader.get('https://example.com/flaky')
+        self.assertEqual(response.content, b'ok')
+        self.assertEqual(len(self.requests), 3)
+    
+    async def test_retry_after_is_honored(self):
+        """测试按 Retry-After 指定的秒数等待后重试"""
+        async def handler(request):
+            if len(self.requests) == 1:
+                return httpx.Response(429, headers={'Retry-After': '0.2'})
+            return httpx.Response(200, content=b'ok')
+        
+        downloader = self.make_downloader(handler, retry_times=3)
+        start = time.monotonic()
+        response = await downloader.get('https://example.com/limited')
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertEqual(response.content, b'ok')
+        self.assertEqual(len(self.requests), 2)
+    
+    async def test_retry_after_is_capped(self):
+        """测试 Retry-After 超过上限时按 MAX_RETRY_DELAY 等待"""
+        async def handler(request):
+            if len(self.requests) == 1:
+                return httpx.Response(503, headers={'Retry-After': '3600'})
+            return httpx.Response(200, content=b'ok')
+        
+        downloader = self.make_downloader(handler, retry_times=3)
+        with mock.patch.object(Downloader, 'MAX_RETRY_DELAY', 0.1):
+            start = time.monotonic()
+            response = await downloader.get('https://example.com/maintenance')
+            elapsed = time.monotonic() - start
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(response.content, b'ok')
+    
+    def test_parse_retry_after(self):
+        """测试 Retry-After 的解析：负数取0，日期格式和缺失时返回None"""
+        cases = [
+            ({'Retry-After': '5'}, 5.0),
+            ({'Retry-After': '-1'}, 0.0),
+            ({'Retry-After': '3600'}, Downloader.MAX_RETRY_DELAY),
+            ({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}, None),
+            ({}, None),
+        ]
+        for headers, expected in cases:
+            with self.subTest(headers=headers):
+                self.assertEqual(Downloader._parse_retry_after(httpx.Response(429, headers=headers)), expected)
+
+class TestPacing(DownloaderTestCase):
+    async def _fetch_all(self, downloader, urls):
+        start = time.monotonic()
+        await asyncio.gather(*(downloader.get(url) for url in urls))
+        return time.monotonic() - start
+    
+    async def test_same_host_requests_are_spaced(self):
+        """测试同一站点的N个请求共耗时约 (N-1)*per_host_delay"""
+        async def handler(request):
+            return httpx.Response(200)
+        
+        downloader = self.make_downloader(handler, per_host_delay=0.1)
+        elapsed = await self._fetch_all(downloader, [f'https://example.com/{i}' for i in range(5)])
+        self.assertGreaterEqual(elapsed, 0.4)
+        self.assertLess(elapsed, 0.7)
+        self.assertEqual(len(self.requests), 5)
+    
+    async def test_different_hosts_do_not_wait(self):
+        """测试不同站点的请求互不等待"""
+        async def handler(request):
+            return httpx.Response(200)
+        
+        downloader = self.make_downloader(handler, per_host_delay=0.5)
+        elapsed = await self._fetch_all(downloader, [f'https://site{i}.example.com/' for i in range(5)])
+        self.assertLess(elapsed, 0.3)
+        self.assertEqual(len(self.requests), 5)
+    
+    async def test_global_concurrency_limit(self):
+        """测试同时进行的请求数不超过 global_concurrency"""
+        active = 0
+        peak = 0
+        
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+            return httpx.Response(200)
+        
+        downloader = self.make_downloader(handler, global_concurrency=2)
+        await self._fetch_all(downloader, [f'https://site{i}.example.com/' for i in range(6)])
+        self.assertEqual(peak, 2)
+        self.assertEqual(len(self.requests), 6)
+
+if __name__ == '__main__':
+    unittest.main()
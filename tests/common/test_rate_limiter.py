@@ -0,0 +1,45 @@
+import asyncio
+import time
+import unittest
+from crawler.common.rate_limiter import TokenBucket
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_up_to_capacity(self):
+        """测试桶容量以内的突发请求立即通过"""
+        bucket = TokenBucket(rate=1.0, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+    
+    async def test_paced_after_burst(self):
+        """测试令牌用完后按 rate 的速率放行"""
+        bucket = TokenBucket(rate=20.0, capacity=2)
+        for _ in range(2):
+            await bucket.acquire()
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        elapsed = time.monotonic() - start
+        self.assertGreaterEqual(elapsed, 4 / 20.0 - 0.01)
+        self.assertLess(elapsed, 4 / 20.0 + 0.1)
+    
+    async def test_concurrent_acquires_are_paced(self):
+        """测试多个协程同时等待时总速率仍不超过 rate"""
+        bucket = TokenBucket(rate=50.0, capacity=1)
+        times = []
+        
+        async def worker():
+            await bucket.acquire()
+            times.append(time.monotonic())
+        
+        start = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(10)))
+        elapsed = time.monotonic() - start
+        # 第一个令牌立即可用，其余9个每个间隔 1/rate 秒
+        self.assertGreaterEqual(elapsed, 9 / 50.0 - 0.01)
+        self.assertLess(elapsed, 9 / 50.0 + 0.1)
+        self.assertEqual(len(times), 10)
+
+if __name__ == '__main__':
+    unittest.main()
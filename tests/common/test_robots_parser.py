@@ -0,0 +1,59 @@
+import random
+import unittest
+from urllib.robotparser import RobotFileParser
+from crawler.common.robots_parser import RobotsParser
+
+# 随机生成规则和URL用的路径片段，包含需要转义和规范化的字符
+PATHS = ['/', '*', '', '/a', '/a/', '/a/b', '/ab', '/b', '/b/c.html', '/a?x=1',
+         '/a%2Fb', '/%E4%B8%AD', '/中', '/a b', '/a;p', '/a#f', '/.*', '/a+b', '/(x)']
+AGENTS = ['*', 'Googlebot', 'Baiduspider']
+
+def _parse(lines):
+    parser = RobotFileParser()
+    parser.parse(lines)
+    return parser
+
+class TestRobotsMatcher(unittest.TestCase):
+    def _assert_same(self, lines, urls):
+        parser = _parse(lines)
+        matcher = RobotsParser._build_matcher(parser)
+        for url in urls:
+            with self.subTest(rules=lines, url=url):
+                self.assertEqual(matcher(url), parser.can_fetch('*', url))
+    
+    def test_first_matching_rule_wins(self):
+        """测试按出现顺序由第一条匹配的规则决定"""
+        lines = ['User-agent: *', 'Allow: /a/b', 'Disallow: /a', 'Allow: /']
+        parser = _parse(lines)
+        matcher = RobotsParser._build_matcher(parser)
+        self.assertTrue(matcher('https://example.com/a/b/c'))
+        self.assertFalse(matcher('https://example.com/a/c'))
+        self.assertTrue(matcher('https://example.com/b'))
+        self._assert_same(lines, ['https://example.com/a/b/c', 'https://example.com/a/c'])
+    
+    def test_agent_specific_and_default_entries(self):
+        """测试只有其他爬虫的条目时使用默认条目"""
+        lines = ['User-agent: Googlebot', 'Disallow: /', '', 'User-agent: *', 'Disallow: /private']
+        parser = _parse(lines)
+        matcher = RobotsParser._build_matcher(parser)
+        self.assertFalse(matcher('https://example.com/private/x'))
+        self.assertTrue(matcher('https://example.com/public'))
+    
+    def test_matches_can_fetch_on_random_rules(self):
+        """差分测试：随机规则和URL下与 RobotFileParser.can_fetch("*", url) 结果一致"""
+        rng = random.Random(20240322)
+        for _ in range(2000):
+            lines = []
+            for _ in range(rng.randint(1, 3)):
+                lines.append(f'User-agent: {rng.choice(AGENTS)}')
+                for _ in range(rng.randint(0, 5)):
+                    lines.append(f"{rng.choice(['Allow', 'Disallow'])}: {rng.choice(PATHS)}")
+                lines.append('')
+            urls = [
+                'https://example.com' + ''.join(rng.choice(PATHS) for _ in range(rng.randint(0, 3)))
+                for _ in range(30)
+            ]
+            self._assert_same(lines, urls)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from crawler.common.url_cache_manager import URLCacheManager
+
+class TestURLCacheManager(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.cache_dir, 'url_cache.json')
+        # 降低合并阈值，少量URL即可触发合并
+        patcher = mock.patch.object(URLCacheManager, 'COMPACT_THRESHOLD', 10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def _urls(self, count, start=0):
+        return [f'https://arxiv.org/abs/{i}' for i in range(start, start + count)]
+    
+    def _count_log_lines(self, manager):
+        with open(manager.log_file, 'r', encoding='utf-8') as f:
+            return sum(1 for _ in f)
+    
+    def test_replay_log_after_restart(self):
+        """测试未关闭时重启后从追加日志恢复"""
+        manager = URLCacheManager(self.cache_file)
+        urls = self._urls(5)
+        for url in urls:
+            manager.add_url('arxiv', url)
+        manager.flush()
+        # 不调用 close，模拟进程中断
+        self.assertFalse(os.path.exists(self.cache_file))
+        
+        reopened = URLCacheManager(self.cache_file)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(reopened.has_url('arxiv', url))
+        self.assertFalse(reopened.has_url('arxiv', 'https://arxiv.org/abs/other'))
+        manager._log.close()
+        reopened.close()
+    
+    def test_truncated_last_line_is_skipped(self):
+        """测试日志最后一行不完整时跳过该行"""
+        manager = URLCacheManager(self.cache_file)
+        manager.add_url('arxiv', 'https://arxiv.org/abs/1')
+        manager.flush()
+        with open(manager.log_file, 'a', encoding='utf-8') as f:
+            f.write('{"d": "arxiv", "u": "https://arx')
+        
+        reopened = URLCacheManager(self.cache_file)
+        self.assertTrue(reopened.has_url('arxiv', 'https://arxiv.org/abs/1'))
+        self.assertEqual(len(reopened.cache['arxiv']), 1)
+        manager._log.close()
+        reopened.close()
+    
+    def test_batched_flush(self):
+        """测试每累计 FLUSH_EVERY 条才写入磁盘一次"""
+        manager = URLCacheManager(self.cache_file)
+        # 合并阈值大于 FLUSH_EVERY，只测试日志的批量写入
+        manager.COMPACT_THRESHOLD = URLCacheManager.FLUSH_EVERY * 2
+        for url in self._urls(URLCacheManager.FLUSH_EVERY - 1):
+            manager.add_url('arxiv', url)
+        self.assertEqual(self._count_log_lines(manager), 0)
+        
+        manager.add_url('arxiv', self._urls(1, start=URLCacheManager.FLUSH_EVERY)[0])
+        self.assertEqual(self._count_log_lines(manager), URLCacheManager.FLUSH_EVERY)
+        manager.close()
+    
+    def test_compaction_truncates_log(self):
+        """测试日志达到阈值时合并到缓存文件并清空日志，重启后所有URL仍然存在"""
+        manager = URLCacheManager(self.cache_file)
+        urls = self._urls(URLCacheManager.COMPACT_THRESHOLD)
+        for url in urls:
+            manager.add_url('arxiv', url)
+        self.assertEqual(os.path.getsize(manager.log_file), 0)
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(sorted(json.load(f)['arxiv']), sorted(urls))
+        
+        # 合并之后新增的URL写入清空后的日志
+        more_urls = self._urls(3, start=len(urls))
+        for url in more_urls:
+            manager.add_url('hf', url)
+        manager.flush()
+        self.assertEqual(self._count_log_lines(manager), len(more_urls))
+        
+        reopened = URLCacheManager(self.cache_file)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(reopened.has_url('arxiv', url))
+        for url in more_urls:
+            with self.subTest(url=url):
+                self.assertTrue(reopened.has_url('hf', url))
+        manager._log.close()
+        reopened.close()
+    
+    def test_close_merges_log(self):
+        """测试关闭时合并日志，重启后不再需要重放"""
+        manager = URLCacheManager(self.cache_file)
+        urls = self._urls(3)
+        for url in urls:
+            manager.add_url('arxiv', url)
+        manager.close()
+        self.assertEqual(os.path.getsize(manager.log_file), 0)
+        
+        reopened = URLCacheManager(self.cache_file)
+        self.assertEqual(reopened._log_count, 0)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(reopened.has_url('arxiv', url))
+        reopened.close()
+
+if __name__ == '__main__':
+    unittest.main()